@@ -0,0 +1,52 @@
+"""
+Positions per second of the NumPy batch kernel behind Evaluator.evaluate_batch
+against the scalar evaluate_board loop, for batch sizes from 1 to 4096.
+(evaluate_batch itself uses the scalar loop below Evaluator.BATCH_MIN_SIZE.)
+
+    python -m Benchmark.batch_eval [min_seconds]
+"""
+import sys
+import time
+
+from IA.Heuristica import Evaluator, np
+from Benchmark.positions import random_positions
+
+
+BATCH_SIZES = [1, 4, 16, 64, 256, 1024, 4096]
+
+
+def _positions_per_second(fn, boards, min_seconds) -> float:
+    done = 0
+    start = time.perf_counter()
+    while True:
+        fn(boards)
+        done += len(boards)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return done / elapsed
+
+
+def _scalar(boards):
+    return [Evaluator.evaluate_board(board) for board in boards]
+
+
+def main():
+    min_seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 0.5
+    if np is None:
+        print("NumPy no está instalado: evaluate_batch usa el camino escalar")
+        return
+    Evaluator.configure_cache(eval_size=0, pawn_size=0)  # sin cachés: se compara el cálculo, no aciertos
+    pool = random_positions(max(BATCH_SIZES), seed=2)
+    if Evaluator._evaluate_batch_np(pool) != _scalar(pool):
+        raise AssertionError("evaluate_batch differs from evaluate_board")
+
+    print(f"{'batch':>6} {'scalar pos/s':>14} {'batch pos/s':>14} {'speedup':>8}")
+    for size in BATCH_SIZES:
+        boards = pool[:size]
+        scalar = _positions_per_second(_scalar, boards, min_seconds)
+        batch = _positions_per_second(Evaluator._evaluate_batch_np, boards, min_seconds)
+        print(f"{size:>6} {scalar:>14.0f} {batch:>14.0f} {batch / scalar:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""
+Time-to-depth of NegamaxChessAI with 1, 2, 4 and 8 Lazy SMP workers on the
+fixed position set. Speedup only shows with that many free cores.
+
+    python -m Benchmark.lazy_smp [depth]
+"""
+import os
+import sys
+import time
+import chess
+
+from IA.NegaMax import NegamaxChessAI
+from Benchmark.positions import FENS
+
+WORKERS = (1, 2, 4, 8)
+
+
+def _run(workers, depth):
+    ai = NegamaxChessAI(depth=depth, workers=workers)
+    nodes = 0
+    start = time.perf_counter()
+    try:
+        for fen in FENS:
+            board = chess.Board(fen)
+            ai.transposition_table.clear()
+            nodes += ai.select_move(board, board.turn).nodes
+    finally:
+        ai.close()
+    return nodes, time.perf_counter() - start
+
+
+def main():
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    print(f"{len(FENS)} positions, depth {depth}, {os.cpu_count()} CPUs")
+    print(f"{'workers':>7} {'nodes':>10} {'time (s)':>9} {'speedup':>8}")
+    base = None
+    for workers in WORKERS:
+        nodes, elapsed = _run(workers, depth)
+        base = base or elapsed
+        print(f"{workers:>7} {nodes:>10} {elapsed:>9.2f} {base / elapsed:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
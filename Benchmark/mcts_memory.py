@@ -0,0 +1,126 @@
+"""
+MCTS tree footprint and speed: nodes holding a board copy each (previous
+layout) against the compact `MCTSNode` that replays moves on one board.
+Reports bytes per node (tracemalloc, separate run) and simulations per second.
+
+    python -m Benchmark.mcts_memory [n_simulations ...]
+"""
+import gc
+import math
+import random
+import sys
+import time
+import tracemalloc
+import chess
+
+from IA.Heuristica import Evaluator
+from IA.MonteCarloTreeSearch import MonteCarloTreeSearchAI
+from IA.Zobrist import zobrist_hash, update_hash
+
+FEN = "r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/R1BQK2R w KQkq - 4 4"
+
+
+class LegacyNode:
+    """Previous layout: one board copy per node, legal moves rebuilt on every visit."""
+
+    def __init__(self, board, parent=None, move=None, zobrist_hash=None):
+        self.board = board.copy()
+        self.parent = parent
+        self.move = move
+        self.children = []
+        self.visits = 0
+        self.wins = 0
+        self.hash = zobrist_hash
+
+    def is_fully_expanded(self):
+        return len(self.children) == len(list(self.board.legal_moves))
+
+    def best_child(self, c_param=1.4):
+        weights = [
+            (c.wins / c.visits) + c_param * ((math.log(self.visits) / c.visits) ** 0.5)
+            if c.visits > 0 else float('inf')
+            for c in self.children
+        ]
+        return self.children[weights.index(max(weights))]
+
+
+def legacy_search(board, n_simulations, top_n=3):
+    root = LegacyNode(board, zobrist_hash=zobrist_hash(board))
+    for _ in range(n_simulations):
+        node = root
+        while node.children and node.is_fully_expanded():
+            node = node.best_child()
+        if not node.board.is_game_over():
+            tried = [c.move for c in node.children]
+            for move in node.board.legal_moves:
+                if move not in tried:
+                    new_board = node.board.copy()
+                    new_board.push(move)
+                    child = LegacyNode(new_board, node, move, update_hash(node.hash, node.board, move))
+                    node.children.append(child)
+                    node = child
+                    break
+        sim_board = node.board.copy()
+        depth = 0
+        while not sim_board.is_game_over() and depth < 30:
+            moves = list(sim_board.legal_moves)
+            moves.sort(key=lambda m: sim_board.is_capture(m), reverse=True)
+            sim_board.push(random.choice(moves[:top_n]))
+            depth += 1
+        if sim_board.is_game_over():
+            result = sim_board.result()
+            reward = 1 if result == '1-0' else 0 if result == '0-1' else 0.5
+        else:
+            reward = 1 / (1 + pow(10, -Evaluator.evaluate_board(sim_board) / 800))
+        while node:
+            node.visits += 1
+            node.wins += reward if node.board.turn == chess.BLACK else 1 - reward
+            node = node.parent
+    return root
+
+
+def compact_search(board, n_simulations):
+    ai = MonteCarloTreeSearchAI(n_simulations=n_simulations)
+    ai.select_move(board, board.turn)
+    return ai._root
+
+
+def _count(root):
+    count, stack = 0, [root]
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(node.children)
+    return count
+
+
+def _measure(search, n_simulations):
+    random.seed(0)
+    board = chess.Board(FEN)
+    start = time.perf_counter()
+    root = search(board, n_simulations)
+    elapsed = time.perf_counter() - start
+    del root
+    gc.collect()
+
+    random.seed(0)
+    tracemalloc.start()
+    root = search(chess.Board(FEN), n_simulations)
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    nodes = _count(root)
+    return nodes, size / nodes, n_simulations / elapsed
+
+
+def main():
+    sims = [int(arg) for arg in sys.argv[1:]] or [3000, 100000]
+    print(f"{'layout':<8} {'sims':>7} {'nodes':>7} {'bytes/node':>11} {'sims/s':>8}")
+    for n in sims:
+        for name, search in (("legacy", legacy_search), ("compact", compact_search)):
+            nodes, per_node, rate = _measure(search, n)
+            print(f"{name:<8} {n:>7} {nodes:>7} {per_node:>11.0f} {rate:>8.0f}")
+
+
+if __name__ == '__main__':
+    main()
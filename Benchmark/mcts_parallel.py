@@ -0,0 +1,49 @@
+"""
+Root-parallel MCTS scaling: simulations per second against the number of
+worker processes (pool start-up excluded). Needs that many free cores.
+
+    python -m Benchmark.mcts_parallel [n_simulations]
+"""
+import os
+import sys
+import time
+import chess
+
+from IA.MonteCarloTreeSearch import MonteCarloTreeSearchAI
+from Benchmark.positions import FENS
+
+WORKERS = (1, 2, 4, 8)
+
+
+def _run(workers, n_simulations, seed=1):
+    ai = MonteCarloTreeSearchAI(n_simulations=n_simulations, reuse_tree=False, workers=workers, seed=seed)
+    try:
+        board = chess.Board(FENS[1])
+        if workers > 1:
+            ai.n_simulations = workers
+            ai.select_move(board, board.turn)  # arranca el pool fuera de la medida
+            ai.n_simulations = n_simulations
+        start = time.perf_counter()
+        moves = []
+        for fen in FENS[:4]:
+            board = chess.Board(fen)
+            moves.append(ai.select_move(board, board.turn).move)
+        elapsed = time.perf_counter() - start
+    finally:
+        ai.close()
+    return 4 * n_simulations / elapsed, moves
+
+
+def main():
+    n_simulations = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    print(f"{n_simulations} simulations per move, 4 positions, {os.cpu_count()} CPUs")
+    print(f"{'workers':>7} {'sims/s':>8} {'speedup':>8}  moves")
+    base = None
+    for workers in WORKERS:
+        rate, moves = _run(workers, n_simulations)
+        base = base or rate
+        print(f"{workers:>7} {rate:>8.0f} {rate / base:>7.2f}x  {' '.join(m.uci() for m in moves)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+Node counts of MinMax and Negamax on a fixed position set, with the previous
+captures-first ordering against MoveOrderer (TT move, MVV-LVA, killers, history).
+
+    python -m Benchmark.move_ordering [depth]
+"""
+import sys
+import time
+import chess
+
+from IA.Min_Max import MinMaxChessAI
+from IA.NegaMax import NegamaxChessAI
+from IA.MoveOrdering import MoveOrderer
+from Benchmark.positions import FENS
+
+
+class CaptureFirstOrderer(MoveOrderer):
+    """Previous behaviour: captures before quiet moves, nothing else."""
+
+    def order(self, board, ply=0, tt_move=None):
+        moves = list(board.legal_moves)
+        moves.sort(key=lambda m: board.is_capture(m), reverse=True)
+        return moves
+
+    def record_cutoff(self, board, move, ply, depth):
+        pass
+
+
+def _run(engine_cls, orderer_cls, depth):
+    nodes = 0
+    start = time.perf_counter()
+    moves = []
+    for fen in FENS:
+        ai = engine_cls(depth=depth)
+        ai.move_orderer = orderer_cls()
+        board = chess.Board(fen)
+        stats = ai.select_move(board, board.turn)
+        nodes += stats.nodes
+        moves.append(stats.move)
+    return nodes, time.perf_counter() - start, moves
+
+
+def main():
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    print(f"{len(FENS)} positions, depth {depth}")
+    print(f"{'engine':<16} {'ordering':<14} {'nodes':>10} {'time (s)':>9}")
+    for engine_cls in (MinMaxChessAI, NegamaxChessAI):
+        results = {}
+        for name, orderer_cls in (("captures-first", CaptureFirstOrderer), ("MoveOrderer", MoveOrderer)):
+            nodes, elapsed, moves = _run(engine_cls, orderer_cls, depth)
+            results[name] = nodes
+            print(f"{engine_cls.__name__:<16} {name:<14} {nodes:>10} {elapsed:>9.2f}")
+        print(f"{'':<16} {'reduction':<14} {results['captures-first'] / max(results['MoveOrderer'], 1):>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
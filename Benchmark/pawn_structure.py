@@ -0,0 +1,97 @@
+"""
+Micro-benchmark: pawn structure term, per-square scans vs bitboard masks.
+
+    python -m Benchmark.pawn_structure [n_positions] [repeats]
+"""
+import sys
+import time
+import chess
+
+from IA.Heuristica import Evaluator
+from Benchmark.positions import random_positions
+
+
+PASSED_BONUS = [0, 10, 20, 35, 60, 100, 180, 0]
+
+
+def legacy_pawn_structure(board: chess.Board) -> int:
+    """Previous implementation (doubled, isolated and passed terms only)."""
+    score = 0
+    for color, sign in ((chess.WHITE, +1), (chess.BLACK, -1)):
+        files = [0] * 8
+        for sq in board.pieces(chess.PAWN, color):
+            files[chess.square_file(sq)] += 1
+        for c in files:
+            if c > 1:
+                score += sign * (-15 * (c - 1))
+        for f, c in enumerate(files):
+            if c == 0:
+                continue
+            left = files[f-1] if f-1 >= 0 else 0
+            right = files[f+1] if f+1 <= 7 else 0
+            if left == 0 and right == 0:
+                score += sign * (-15)
+    for sq in board.pieces(chess.PAWN, chess.WHITE):
+        f = chess.square_file(sq)
+        r = chess.square_rank(sq)
+        blockers = []
+        for df in (-1, 0, 1):
+            ff = f + df
+            if 0 <= ff < 8:
+                for rr in range(r+1, 8):
+                    blockers.append(chess.square(ff, rr))
+        if not any(board.piece_at(s) == chess.Piece(chess.PAWN, chess.BLACK) for s in blockers):
+            score += PASSED_BONUS[r]
+    for sq in board.pieces(chess.PAWN, chess.BLACK):
+        f = chess.square_file(sq)
+        r = chess.square_rank(sq)
+        blockers = []
+        for df in (-1, 0, 1):
+            ff = f + df
+            if 0 <= ff < 8:
+                for rr in range(0, r):
+                    blockers.append(chess.square(ff, rr))
+        if not any(board.piece_at(s) == chess.Piece(chess.PAWN, chess.WHITE) for s in blockers):
+            score -= PASSED_BONUS[7-r]
+    return score
+
+
+def _time_per_call(fn, boards, repeats) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for board in boards:
+            fn(board)
+    return (time.perf_counter() - start) / (repeats * len(boards))
+
+
+def _check_same_terms(boards):
+    # Con los términos nuevos a cero, ambas versiones deben coincidir exactamente
+    saved = Evaluator.BACKWARD_PENALTY, Evaluator.CONNECTED_BONUS
+    Evaluator.BACKWARD_PENALTY = Evaluator.CONNECTED_BONUS = 0
+    try:
+        for board in boards:
+            if Evaluator._pawn_structure(board) != legacy_pawn_structure(board):
+                raise AssertionError(f"pawn structure mismatch in {board.fen()}")
+    finally:
+        Evaluator.BACKWARD_PENALTY, Evaluator.CONNECTED_BONUS = saved
+
+
+def main():
+    n_positions = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    boards = random_positions(n_positions, seed=1)
+    # Sin cachés: se mide el código de evaluación, no aciertos de la tabla de peones
+    # (y _check_same_terms cambia pesos, que dejarían puntuaciones obsoletas en ella)
+    Evaluator.configure_cache(eval_size=0, pawn_size=0)
+    _check_same_terms(boards)
+
+    legacy = _time_per_call(legacy_pawn_structure, boards, repeats)
+    masks = _time_per_call(Evaluator._pawn_structure, boards, repeats)
+    print(f"positions: {len(boards)}  repeats: {repeats}")
+    print(f"per-square scan : {legacy * 1e6:8.2f} us/call")
+    print(f"bitboard masks  : {masks * 1e6:8.2f} us/call")
+    print(f"speedup         : {legacy / masks:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+Rollouts per second: the previous playout loop (full legal list sorted by
+capture, random among the first `top_n`, is_game_over on every ply) against
+RolloutEngine with each policy, from the fixed position set.
+
+    python -m Benchmark.rollout [rollouts_per_position]
+"""
+import random
+import sys
+import time
+import chess
+
+from IA.Heuristica import Evaluator
+from IA.Rollout import RolloutEngine
+from Benchmark.positions import FENS
+
+
+def legacy_rollout(board, rng, top_n=3, max_depth=30):
+    sim_board = board.copy()
+    depth = 0
+    while not sim_board.is_game_over() and depth < max_depth:
+        moves = list(sim_board.legal_moves)
+        moves.sort(key=lambda m: sim_board.is_capture(m), reverse=True)
+        sim_board.push(rng.choice(moves[:min(top_n, len(moves))]))
+        depth += 1
+    if sim_board.is_game_over():
+        result = sim_board.result()
+        return 1 if result == '1-0' else 0 if result == '0-1' else 0.5
+    return 1 / (1 + pow(10, -Evaluator.evaluate_board(sim_board) / 800))
+
+
+def _rate(run, n):
+    boards = [chess.Board(fen) for fen in FENS]
+    start = time.perf_counter()
+    total = 0.0
+    for board in boards:
+        for _ in range(n):
+            total += run(board)
+    elapsed = time.perf_counter() - start
+    return len(boards) * n / elapsed, total / (len(boards) * n)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    print(f"{len(FENS)} positions x {n} rollouts, 30 plies max")
+    print(f"{'rollout':<10} {'rollouts/s':>10} {'speedup':>8} {'mean reward':>12}")
+    rng = random.Random(0)
+    base, mean = _rate(lambda board: legacy_rollout(board, rng), n)
+    print(f"{'legacy':<10} {base:>10.0f} {1:>7.2f}x {mean:>12.3f}")
+    for policy in RolloutEngine.POLICIES:
+        engine = RolloutEngine(policy, rng=random.Random(0))
+        rate, mean = _rate(engine.run, n)
+        print(f"{policy:<10} {rate:>10.0f} {rate / base:>7.2f}x {mean:>12.3f}")
+
+
+if __name__ == '__main__':
+    main()
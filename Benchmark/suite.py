@@ -0,0 +1,198 @@
+"""
+Benchmark suite: perft on the standard test positions (move generation speed
+and correctness) and every engine at fixed depth / simulations on the bundled
+EPD set, compared against a stored baseline.
+
+    python -m Benchmark.suite                 # run and compare with Benchmark/baseline.json
+    python -m Benchmark.suite --save          # run and overwrite the baseline
+    python -m Benchmark.suite --engines negamax mcts --threshold 0.3
+
+The exit code is 1 when a perft count is wrong or something is flagged
+against the baseline (slower than `--threshold`, different node count or
+different best move), so it can gate a commit.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import chess
+
+from IA.Heuristica import Evaluator
+from IA.Registry import build_ai
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+EPD_PATH = os.path.join(HERE, "positions.epd")
+BASELINE_PATH = os.path.join(HERE, "baseline.json")
+MIN_SLOWDOWN = 0.05  # segundos
+
+# (nombre, FEN, profundidad, nodos esperados) — valores de referencia de la wiki de programación de ajedrez
+PERFT = [
+    ("start", chess.STARTING_FEN, 4, 197281),
+    ("kiwipete", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1", 3, 97862),
+    ("position3", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", 4, 43238),
+    ("position4", "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1", 3, 9467),
+    ("position5", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8", 3, 62379),
+]
+
+# Motores a profundidad / simulaciones fijas (semilla fija para que MCTS sea reproducible;
+# sin bitbases, que no están en el repositorio y cambiarían la búsqueda en finales)
+ENGINES = {
+    "minmax": "minmax:depth={depth},use_bitbases=False",
+    "negamax": "negamax:depth={depth},use_bitbases=False",
+    "mcts": "mcts:n_simulations={sims},seed=1,reuse_tree=False",
+    "heuristic": "heuristic",
+}
+
+
+# ------------------ PERFT ------------------ #
+def perft(board: chess.Board, depth: int) -> int:
+    """Leaf count of the legal move tree (the last ply is counted without pushing)."""
+    if depth <= 1:
+        return board.legal_moves.count() if depth == 1 else 1
+    nodes = 0
+    for move in board.legal_moves:
+        board.push(move)
+        nodes += perft(board, depth - 1)
+        board.pop()
+    return nodes
+
+
+def run_perft(scale: int = 0) -> dict:
+    results = {}
+    for name, fen, depth, expected in PERFT:
+        depth = max(depth + scale, 1)
+        board = chess.Board(fen)
+        start = time.perf_counter()
+        nodes = perft(board, depth)
+        elapsed = time.perf_counter() - start
+        results[name] = {"depth": depth, "nodes": nodes, "time": round(elapsed, 4),
+                         "nps": round(nodes / max(elapsed, 1e-9)), "ok": nodes == expected if scale == 0 else None}
+    return results
+
+
+# ------------------ ENGINES ------------------ #
+def load_epd(path: str = EPD_PATH) -> list:
+    """[(id, board)] of an EPD file; positions without an `id` get their line number."""
+    positions = []
+    with open(path, encoding="utf-8") as f:
+        for n, line in enumerate(f, 1):
+            if not line.strip() or line.startswith('#'):
+                continue
+            board, ops = chess.Board.from_epd(line)
+            positions.append((str(ops.get("id", n)), board))
+    return positions
+
+
+def run_engine(spec: str, positions: list) -> dict:
+    results = {}
+    for pos_id, board in positions:
+        ai = build_ai(spec)
+        board = board.copy()
+        Evaluator.configure_cache()  # cachés vacías: cada posición se mide en frío
+        start = time.perf_counter()
+        stats = ai.select_move(board, board.turn)
+        elapsed = time.perf_counter() - start
+        move, nodes = stats.move, stats.nodes
+        if hasattr(ai, 'close'):
+            ai.close()
+        results[pos_id] = {"nodes": nodes, "time": round(elapsed, 4),
+                           "nps": round(nodes / max(elapsed, 1e-9)), "move": move.uci() if move else None}
+    return results
+
+
+# ------------------ BASELINE ------------------ #
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """Regressions of `current` against `baseline` as readable lines."""
+    flags = []
+    for name, res in current["perft"].items():
+        if res["ok"] is False:
+            flags.append(f"perft {name}: {res['nodes']} nodes, expected {dict((p[0], p[3]) for p in PERFT)[name]}")
+        old = baseline.get("perft", {}).get(name)
+        if old and old["depth"] == res["depth"] and res["nps"] < old["nps"] * (1 - threshold):
+            flags.append(f"perft {name}: {res['nps']:.0f} nps, baseline {old['nps']:.0f}")
+
+    for engine, positions in current["engines"].items():
+        old_positions = baseline.get("engines", {}).get(engine)
+        if not old_positions:
+            continue
+        if baseline.get("settings", {}).get(engine) != current["settings"][engine]:
+            flags.append(f"{engine}: settings {current['settings'][engine]!r} differ from baseline "
+                         f"{baseline.get('settings', {}).get(engine)!r}, not compared")
+            continue
+        # El tiempo se compara sobre el total del motor (por posición es demasiado ruidoso),
+        # con un margen absoluto para los motores que tardan milisegundos
+        total = sum(r["time"] for r in positions.values())
+        old_total = sum(r["time"] for pid, r in old_positions.items() if pid in positions)
+        if old_total and total > old_total * (1 + threshold) and total - old_total > MIN_SLOWDOWN:
+            flags.append(f"{engine}: {total:.2f}s, baseline {old_total:.2f}s (+{total / old_total - 1:.0%})")
+        for pos_id, res in positions.items():
+            old = old_positions.get(pos_id)
+            if old is None:
+                continue
+            if res["move"] != old["move"]:
+                flags.append(f"{engine} {pos_id}: best move {res['move']}, baseline {old['move']}")
+            if res["nodes"] != old["nodes"]:
+                flags.append(f"{engine} {pos_id}: {res['nodes']} nodes, baseline {old['nodes']}")
+    return flags
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de perft y de los motores.")
+    parser.add_argument("--engines", nargs="*", default=list(ENGINES), choices=list(ENGINES))
+    parser.add_argument("--depth", type=int, default=3, help="profundidad de MinMax / Negamax")
+    parser.add_argument("--sims", type=int, default=200, help="simulaciones de MCTS")
+    parser.add_argument("--perft-scale", type=int, default=0, help="suma a las profundidades de perft")
+    parser.add_argument("--no-perft", action="store_true")
+    parser.add_argument("--epd", default=EPD_PATH)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=0.2, help="ralentización tolerada (0.2 = 20%%)")
+    parser.add_argument("--save", action="store_true", help="guardar los resultados como nueva referencia")
+    args = parser.parse_args()
+
+    current = {"perft": {}, "engines": {}, "settings": {}}
+    if not args.no_perft:
+        print(f"{'perft':<12} {'depth':>5} {'nodes':>10} {'time (s)':>9} {'nps':>10}  ok")
+        current["perft"] = run_perft(args.perft_scale)
+        for name, res in current["perft"].items():
+            print(f"{name:<12} {res['depth']:>5} {res['nodes']:>10} {res['time']:>9.2f} {res['nps']:>10.0f}  "
+                  f"{'-' if res['ok'] is None else res['ok']}")
+
+    positions = load_epd(args.epd)
+    for engine in args.engines:
+        spec = ENGINES[engine].format(depth=args.depth, sims=args.sims)
+        current["settings"][engine] = spec
+        print(f"\n{spec}")
+        print(f"{'position':<14} {'move':<7} {'nodes':>9} {'time (s)':>9} {'nps':>9}")
+        current["engines"][engine] = run_engine(spec, positions)
+        for pos_id, res in current["engines"][engine].items():
+            print(f"{pos_id:<14} {res['move'] or '-':<7} {res['nodes']:>9} {res['time']:>9.2f} {res['nps']:>9.0f}")
+
+    if args.save:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        # Se conservan los motores que no se han vuelto a medir
+        for key in ("perft", "engines", "settings"):
+            baseline.setdefault(key, {}).update(current[key])
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=1, sort_keys=True)
+        print(f"\nbaseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nno baseline at {args.baseline} (run with --save)")
+        flags = compare(current, {}, args.threshold)
+    else:
+        with open(args.baseline, encoding="utf-8") as f:
+            flags = compare(current, json.load(f), args.threshold)
+    print()
+    for line in flags:
+        print(f"REGRESSION  {line}")
+    print(f"{len(flags)} regression(s) flagged" if flags else "no regressions against the baseline")
+    return 1 if flags else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,132 @@
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Bounded key -> value map that evicts the least recently used entry.
+    Every access takes a lock, so one instance can be shared by several
+    threads (e.g. the pondering thread and the main search).
+    """
+
+    def __init__(self, size: int):
+        if size < 1:
+            raise ValueError("cache size must be at least 1")
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self.__lock:
+            value = self.__entries.get(key, self)
+            if value is self:
+                self.misses += 1
+                return default
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self.__lock:
+            entries = self.__entries
+            entries[key] = value
+            entries.move_to_end(key)
+            if len(entries) > self.size:
+                entries.popitem(last=False)
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self.__entries)
+
+    @property
+    def hit_rate(self) -> float:
+        probes = self.hits + self.misses
+        return self.hits / probes if probes else 0.0
+
+
+class ClockCache:
+    """
+    Bounded key -> value map with CLOCK (second chance) eviction: a hit only
+    sets the reference bit of its slot, and the hand sweeping the slots for a
+    victim clears bits until it finds an entry not used since its last pass.
+
+    Lookups do not take the lock: each slot holds a (key, value) tuple that is
+    replaced in one assignment, and a lookup checks the key it read back, so a
+    slot recycled by a concurrent `put` reads as a miss. Only `put` locks.
+    """
+
+    def __init__(self, size: int):
+        if size < 1:
+            raise ValueError("cache size must be at least 1")
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self.__index = {}
+        self.__slots = [None] * size
+        self.__referenced = bytearray(size)
+        self.__hand = 0
+        self.__lock = threading.Lock()
+
+    def get(self, key, default=None):
+        i = self.__index.get(key)
+        if i is not None:
+            entry = self.__slots[i]
+            if entry is not None and entry[0] == key:
+                self.__referenced[i] = 1
+                self.hits += 1
+                return entry[1]
+        self.misses += 1
+        return default
+
+    def put(self, key, value):
+        with self.__lock:
+            index, slots, referenced = self.__index, self.__slots, self.__referenced
+            i = index.get(key)
+            if i is None:
+                # Segunda oportunidad: se limpian bits hasta dar con un hueco sin referencia
+                hand = self.__hand
+                while referenced[hand]:
+                    referenced[hand] = 0
+                    hand = (hand + 1) % self.size
+                i = hand
+                self.__hand = (hand + 1) % self.size
+                old = slots[i]
+                if old is not None:
+                    del index[old[0]]
+                index[key] = i
+            slots[i] = (key, value)
+            referenced[i] = 1
+
+    def clear(self):
+        with self.__lock:
+            self.__index.clear()
+            self.__slots = [None] * self.size
+            self.__referenced = bytearray(self.size)
+            self.__hand = 0
+            self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self.__index)
+
+    @property
+    def hit_rate(self) -> float:
+        probes = self.hits + self.misses
+        return self.hits / probes if probes else 0.0
+
+
+POLICIES = {'lru': LRUCache, 'clock': ClockCache}
+
+
+def make_cache(size: int, policy: str = 'clock'):
+    """Cache of `size` entries with the given eviction policy ('lru' or 'clock'); None when size is 0."""
+    if policy not in POLICIES:
+        raise ValueError(f"unknown cache policy {policy!r} (expected one of {', '.join(POLICIES)})")
+    if not size:
+        return None
+    return POLICIES[policy](size)
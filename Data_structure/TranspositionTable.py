@@ -0,0 +1,137 @@
+import chess
+
+
+class TranspositionTable:
+    """
+    Fixed-size transposition table stored in one flat buffer.
+
+    Every entry takes 16 bytes: a 64-bit data word (move, depth, bound, age,
+    score) and the position key XOR-ed with that word. A probe only accepts
+    the entry when `check ^ data == key`, so a torn write (e.g. from another
+    process sharing the buffer) reads as a miss instead of a wrong score.
+    Entries are grouped in buckets of two slots.
+    """
+
+    EXACT, LOWER, UPPER = 0, 1, 2
+    ENTRY_BYTES = 16
+    BUCKET_SLOTS = 2
+
+    _SCORE_OFFSET = 1 << 31
+    _MASK64 = (1 << 64) - 1
+
+    def __init__(self, size_mb: float = 16, buffer=None):
+        if buffer is None:
+            n_entries = self.entries_for(size_mb)
+            buffer = bytearray(n_entries * self.ENTRY_BYTES)
+        else:
+            n_entries = len(buffer) // self.ENTRY_BYTES
+        if n_entries < self.BUCKET_SLOTS or n_entries & (n_entries - 1):
+            raise ValueError("transposition table size must be a power of two entries")
+        self.__buffer = buffer
+        self.__words = memoryview(buffer).cast('Q')
+        self.__bucket_mask = n_entries // self.BUCKET_SLOTS - 1
+        self.size = n_entries
+        self.age = 0
+
+    @classmethod
+    def entries_for(cls, size_mb: float) -> int:
+        """Largest power of two number of entries that fits in `size_mb` megabytes."""
+        n_entries = cls.BUCKET_SLOTS
+        limit = int(size_mb * 1024 * 1024) // cls.ENTRY_BYTES
+        while n_entries * 2 <= limit:
+            n_entries *= 2
+        return n_entries
+
+    @property
+    def buffer(self):
+        return self.__buffer
+
+    def new_search(self):
+        """Start a new search: entries from older searches become preferred victims."""
+        self.age = (self.age + 1) & 0x3F
+
+    def release(self):
+        """Drop the views on the buffer (needed before closing a shared memory block)."""
+        self.__words.release()
+
+    def clear(self):
+        memoryview(self.__buffer)[:] = bytes(len(self.__buffer))
+        self.age = 0
+
+    # ------------------ ENCODING ------------------ #
+    @staticmethod
+    def encode_move(move: chess.Move) -> int:
+        if not move:
+            return 0
+        return move.from_square | (move.to_square << 6) | ((move.promotion or 0) << 12)
+
+    @staticmethod
+    def decode_move(code: int):
+        if not code:
+            return None
+        return chess.Move(code & 0x3F, (code >> 6) & 0x3F, (code >> 12) or None)
+
+    # ------------------ PROBE / STORE ------------------ #
+    def probe(self, key: int):
+        """Return (depth, score, flag, move) for `key`, or None on a miss."""
+        words = self.__words
+        i = ((key & self.__bucket_mask) * self.BUCKET_SLOTS) << 1
+        for slot in (i, i + 2):
+            data = words[slot + 1]
+            if data and words[slot] ^ data == key:
+                return (
+                    (data >> 16) & 0xFF,
+                    (data >> 32) - self._SCORE_OFFSET,
+                    (data >> 24) & 0x3,
+                    self.decode_move(data & 0xFFFF),
+                )
+        return None
+
+    def store(self, key: int, depth: int, score: int, flag: int, move: chess.Move = None):
+        words = self.__words
+        i = ((key & self.__bucket_mask) * self.BUCKET_SLOTS) << 1
+        age = self.age
+
+        # Slot a reemplazar: la misma posición si ya está; si no, la entrada de
+        # una búsqueda anterior o, a igual edad, la de menor profundidad.
+        victim = None
+        victim_worth = None
+        for slot in (i, i + 2):
+            data = words[slot + 1]
+            if data and words[slot] ^ data == key:
+                if depth < (data >> 16) & 0xFF and flag != self.EXACT and (data >> 26) & 0x3F == age:
+                    return
+                if move is None:
+                    move = self.decode_move(data & 0xFFFF)
+                victim = slot
+                break
+            if not data:
+                worth = -2
+            elif (data >> 26) & 0x3F == age:
+                worth = (data >> 16) & 0xFF
+            else:
+                worth = -1
+            if victim is None or worth < victim_worth:
+                victim, victim_worth = slot, worth
+
+        score = max(1 - self._SCORE_OFFSET, min(self._SCORE_OFFSET - 1, int(score)))
+        data = (
+            self.encode_move(move)
+            | (min(max(depth, 0), 0xFF) << 16)
+            | (flag << 24)
+            | (age << 26)
+            | ((score + self._SCORE_OFFSET) << 32)
+        )
+        words[victim] = (key ^ data) & self._MASK64
+        words[victim + 1] = data
+
+    def hashfull(self, sample: int = 1000) -> int:
+        """Per-mille of the first `sample` entries used by the current search."""
+        words = self.__words
+        sample = min(sample, self.size)
+        used = 0
+        for slot in range(0, sample * 2, 2):
+            data = words[slot + 1]
+            if data and ((data >> 26) & 0x3F) == self.age:
+                used += 1
+        return used * 1000 // sample
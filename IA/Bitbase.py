@@ -0,0 +1,302 @@
+"""
+Win/draw bitbases for KQK, KRK and KPK generated by retrograde analysis.
+
+    python -m IA.Bitbase [path]      # genera el fichero (unos segundos, una sola vez)
+
+Positions are normalised so that the side with the extra piece ("strong")
+is White. Index = ((stm * 64 + strong king) * 64 + weak king) * 64 + piece,
+stm 0 when the strong side moves. A set bit means the strong side wins
+(with the weak side to move: the weak side loses); everything else is a
+draw or an impossible position. The weak side owns a bare king, so it can
+never win. The file is the 8-byte MAGIC and one 64 KiB block per signature
+in SIGNATURES order, read through mmap.
+"""
+import mmap
+import os
+import sys
+from collections import deque
+import chess
+
+MAGIC = b"CHBB0001"
+SIGNATURES = ('KQK', 'KRK', 'KPK')
+PIECE_OF = {'KQK': chess.QUEEN, 'KRK': chess.ROOK, 'KPK': chess.PAWN}
+N_POSITIONS = 2 * 64 * 64 * 64
+BLOCK = N_POSITIONS // 8
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bitbases.bin")
+
+
+def index(stm: int, strong_king: int, weak_king: int, piece: int) -> int:
+    return ((stm * 64 + strong_king) * 64 + weak_king) * 64 + piece
+
+
+# ------------------ MOVE GENERATION ON INDICES ------------------ #
+def _attacks(piece_type: int, sq: int, occupied: int) -> int:
+    """Squares attacked by the strong piece (a white pawn for PAWN)."""
+    if piece_type == chess.PAWN:
+        return chess.BB_PAWN_ATTACKS[chess.WHITE][sq]
+    rook = (chess.BB_RANK_ATTACKS[sq][chess.BB_RANK_MASKS[sq] & occupied]
+            | chess.BB_FILE_ATTACKS[sq][chess.BB_FILE_MASKS[sq] & occupied])
+    if piece_type == chess.ROOK:
+        return rook
+    return rook | chess.BB_DIAG_ATTACKS[sq][chess.BB_DIAG_MASKS[sq] & occupied]
+
+
+def _valid(piece_type: int, stm: int, sk: int, wk: int, p: int) -> bool:
+    if sk == wk or sk == p or wk == p:
+        return False
+    if chess.BB_KING_ATTACKS[sk] & chess.BB_SQUARES[wk]:
+        return False
+    if piece_type == chess.PAWN and not 8 <= p < 56:
+        return False
+    if stm == 0:
+        # El bando débil no puede estar en jaque si mueve el fuerte
+        occupied = chess.BB_SQUARES[sk] | chess.BB_SQUARES[wk] | chess.BB_SQUARES[p]
+        if _attacks(piece_type, p, occupied) & chess.BB_SQUARES[wk]:
+            return False
+    return True
+
+
+def _weak_moves(piece_type: int, sk: int, wk: int, p: int):
+    """
+    Weak king moves from a weak-to-move position: (targets for a quiet move,
+    can capture the piece, in check).
+    """
+    occupied = chess.BB_SQUARES[sk] | chess.BB_SQUARES[p]  # sin el rey débil: rayos que lo atraviesan
+    attacked = chess.BB_KING_ATTACKS[sk] | _attacks(piece_type, p, occupied)
+    targets = chess.BB_KING_ATTACKS[wk] & ~attacked
+    capture = bool(targets & chess.BB_SQUARES[p])
+    in_check = bool(attacked & chess.BB_SQUARES[wk])
+    return targets & ~chess.BB_SQUARES[p], capture, in_check
+
+
+def _strong_unmoves(piece_type: int, sk: int, wk: int, p: int):
+    """Strong-to-move predecessors (sk, p) of the weak-to-move position (sk, wk, p), excluding promotions."""
+    occupied = chess.BB_SQUARES[sk] | chess.BB_SQUARES[wk] | chess.BB_SQUARES[p]
+    for prev in chess.scan_forward(chess.BB_KING_ATTACKS[sk] & ~occupied & ~chess.BB_KING_ATTACKS[wk]):
+        yield prev, p
+    if piece_type == chess.PAWN:
+        prev = p - 8
+        if prev >= 8 and not occupied & chess.BB_SQUARES[prev]:
+            yield sk, prev
+            if 24 <= p < 32 and not occupied & chess.BB_SQUARES[p - 16]:
+                yield sk, p - 16
+    else:
+        for prev in chess.scan_forward(_attacks(piece_type, p, occupied) & ~occupied):
+            yield sk, prev
+
+
+def _weak_unmoves(sk: int, wk: int, p: int):
+    """Weak-to-move predecessors (weak king squares) of the strong-to-move position (sk, wk, p)."""
+    occupied = chess.BB_SQUARES[sk] | chess.BB_SQUARES[wk] | chess.BB_SQUARES[p]
+    return chess.scan_forward(chess.BB_KING_ATTACKS[wk] & ~occupied & ~chess.BB_KING_ATTACKS[sk])
+
+
+# ------------------ RETROGRADE GENERATION ------------------ #
+def generate_table(signature: str, promotions: dict = None) -> bytearray:
+    """
+    Retrograde analysis of one signature. Start from the positions where the
+    weak king is mated (and, for KPK, from the promotions that reach a won
+    KQK/KRK position, `promotions` maps QUEEN/ROOK to those tables); then
+    un-move: a predecessor with the strong side to move wins as soon as one
+    successor is lost for the weak side, a predecessor with the weak side to
+    move is lost once all its moves lead to strong wins.
+    """
+    piece_type = PIECE_OF[signature]
+    win = bytearray(N_POSITIONS)
+    remaining = [0] * (N_POSITIONS // 2)  # jugadas del bando débil aún no perdedoras
+    queue = deque()
+
+    for sk in range(64):
+        for wk in range(64):
+            for p in range(64):
+                if not _valid(piece_type, 1, sk, wk, p):
+                    continue
+                targets, capture, in_check = _weak_moves(piece_type, sk, wk, p)
+                n_moves = chess.popcount(targets) + capture
+                i = index(1, sk, wk, p)
+                remaining[i - N_POSITIONS // 2] = n_moves
+                if n_moves == 0 and in_check:
+                    win[i] = 1
+                    queue.append(i)
+
+    if piece_type == chess.PAWN:
+        # Promociones: ganan si la posición resultante de KQK/KRK está perdida para el débil
+        for p in range(48, 56):
+            to_sq = p + 8
+            for sk in range(64):
+                for wk in range(64):
+                    if not _valid(piece_type, 0, sk, wk, p) or to_sq in (sk, wk):
+                        continue
+                    j = index(1, sk, wk, to_sq)
+                    for promoted in (chess.QUEEN, chess.ROOK):
+                        if promotions[promoted][j >> 3] >> (j & 7) & 1:
+                            i = index(0, sk, wk, p)
+                            if not win[i]:
+                                win[i] = 1
+                                queue.append(i)
+                            break
+
+    while queue:
+        i = queue.popleft()
+        stm, rest = divmod(i, 64 * 64 * 64)
+        sk, rest = divmod(rest, 64 * 64)
+        wk, p = divmod(rest, 64)
+        if stm == 1:
+            for prev_sk, prev_p in _strong_unmoves(piece_type, sk, wk, p):
+                j = index(0, prev_sk, wk, prev_p)
+                if not win[j] and _valid(piece_type, 0, prev_sk, wk, prev_p):
+                    win[j] = 1
+                    queue.append(j)
+        else:
+            for prev_wk in _weak_unmoves(sk, wk, p):
+                if not _valid(piece_type, 1, sk, prev_wk, p):
+                    continue
+                j = index(1, sk, prev_wk, p)
+                if win[j]:
+                    continue
+                remaining[j - N_POSITIONS // 2] -= 1
+                if remaining[j - N_POSITIONS // 2] == 0:
+                    win[j] = 1
+                    queue.append(j)
+
+    return _pack(win)
+
+
+def _pack(flags: bytearray) -> bytearray:
+    packed = bytearray(BLOCK)
+    for i in range(BLOCK):
+        byte = 0
+        base = i * 8
+        for bit in range(8):
+            if flags[base + bit]:
+                byte |= 1 << bit
+        packed[i] = byte
+    return packed
+
+
+def generate(path: str = DEFAULT_PATH, verbose: bool = False):
+    """Generate every signature and write the bitbase file."""
+    tables = {}
+    for signature in SIGNATURES:
+        if verbose:
+            print(f"generando {signature}...")
+        promotions = {chess.QUEEN: tables.get('KQK'), chess.ROOK: tables.get('KRK')}
+        tables[signature] = generate_table(signature, promotions)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as out:
+        out.write(MAGIC)
+        for signature in SIGNATURES:
+            out.write(tables[signature])
+    os.replace(tmp, path)
+
+
+# ------------------ PROBING ------------------ #
+class Bitbases:
+    """Memory-mapped bitbase file; `probe` answers in O(1) for KQK, KRK and KPK."""
+
+    WIN, DRAW, LOSS = 1, 0, -1
+    MAX_PIECES = 3
+    WIN_SCORE = 5000  # por debajo de Evaluator.MATE: un mate visto sigue siendo mejor
+
+    _default = None
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(MAGIC)] != MAGIC or len(self._map) != len(MAGIC) + BLOCK * len(SIGNATURES):
+            self.close()
+            raise ValueError(f"{path} is not a bitbase file")
+        self._offset = {sig: len(MAGIC) + k * BLOCK for k, sig in enumerate(SIGNATURES)}
+        self.probes = 0
+        self.hits = 0
+
+    @classmethod
+    def load_default(cls):
+        """Shared instance over DEFAULT_PATH, or None if the file was not generated."""
+        if cls._default is None and os.path.exists(DEFAULT_PATH):
+            cls._default = cls(DEFAULT_PATH)
+        return cls._default
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def _lookup(self, board: chess.Board):
+        """(signature, index, strong color) of `board`, or None if it is not covered."""
+        if chess.popcount(board.occupied) != 3 or board.castling_rights:
+            return None
+        for signature, piece_type in PIECE_OF.items():
+            mask = board.pieces_mask(piece_type, chess.WHITE) | board.pieces_mask(piece_type, chess.BLACK)
+            if mask:
+                break
+        else:
+            return None
+        p = chess.lsb(mask)
+        strong = chess.WHITE if board.occupied_co[chess.WHITE] & mask else chess.BLACK
+        sk = board.king(strong)
+        wk = board.king(not strong)
+        if strong == chess.BLACK:
+            # Normalizar: el bando fuerte juega con blancas
+            sk, wk, p = sk ^ 56, wk ^ 56, p ^ 56
+        stm = 0 if board.turn == strong else 1
+        return signature, index(stm, sk, wk, p), strong
+
+    def probe(self, board: chess.Board):
+        """WIN / DRAW / LOSS for the side to move, or None if `board` is not covered."""
+        self.probes += 1
+        found = self._lookup(board)
+        if found is None:
+            return None
+        self.hits += 1
+        signature, i, strong = found
+        won = self._map[self._offset[signature] + (i >> 3)] >> (i & 7) & 1
+        if not won:
+            return self.DRAW
+        return self.WIN if board.turn == strong else self.LOSS
+
+    def search_score(self, board: chess.Board):
+        """Score for the side to move: ±(WIN_SCORE + mop-up) for a won ending, 0 for a draw, None if not covered."""
+        result = self.probe(board)
+        if result is None:
+            return None
+        if result == self.DRAW:
+            return 0
+        strong = board.turn if result == self.WIN else not board.turn
+        score = self.WIN_SCORE + self.mop_up(board, strong)
+        return score if result == self.WIN else -score
+
+    @staticmethod
+    def mop_up(board: chess.Board, strong: chess.Color) -> int:
+        """
+        Progress term for won endings, so the search converts instead of
+        shuffling: push the pawn, or drive the bare king to the edge and
+        bring the strong king close. Pawn endings always score below the
+        KQK / KRK positions they promote to, and a queen above a rook.
+        """
+        sk = board.king(strong)
+        wk = board.king(not strong)
+        pawns = board.pawns
+        if pawns:
+            p = chess.lsb(pawns)
+            rank = chess.square_rank(p) if strong == chess.WHITE else 7 - chess.square_rank(p)
+            return 50 * rank - 5 * chess.square_distance(sk, p) - 400
+        file, rank = chess.square_file(wk), chess.square_rank(wk)
+        edge = max(3 - file, file - 4) + max(3 - rank, rank - 4)
+        piece_bonus = 100 if board.queens else 0
+        return piece_bonus + 20 * edge + 10 * (14 - chess.square_manhattan_distance(sk, wk))
+
+    def filter_root_moves(self, board: chess.Board, moves: list) -> list:
+        """At a won root keep only the moves that keep the win (all moves otherwise)."""
+        if self.probe(board) != self.WIN:
+            return moves
+        keeping = []
+        for move in moves:
+            board.push(move)
+            if board.is_checkmate() or self.probe(board) == self.LOSS:
+                keeping.append(move)
+            board.pop()
+        return keeping or moves
+
+
+if __name__ == '__main__':
+    generate(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH, verbose=True)
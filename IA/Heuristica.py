@@ -1,7 +1,18 @@
-from IA_interfaze import ChessAI
+from IA_interfaze import ChessAI, SearchStats
+from Data_structure.Cache import make_cache
+from IA.Zobrist import zobrist_hash, update_hash
 import chess
 import random
+import time
 
+try:
+	import numpy as np
+except ImportError:  # NumPy es opcional: evaluate_batch usa entonces el camino escalar
+	np = None
+
+
+def psq_index(color: chess.Color, piece_type: chess.PieceType, square: chess.Square) -> int:
+	return ((0 if color else 6) + piece_type - 1) * 64 + square
 
 
 class Evaluator:
@@ -16,6 +27,16 @@ class Evaluator:
 	MATE = 10000
 	CHECK_BONUS = 25
 	MOBILITY_W = 2  # peso por movida de diferencia (ajustable)
+	# 'fast': ataques pseudo-legales por pieza; 'exact': movimientos legales de ambos bandos
+	MOBILITY_MODE = 'fast'
+	MOBILITY_PIECE_W = {chess.KNIGHT: 4, chess.BISHOP: 3, chess.ROOK: 2, chess.QUEEN: 1}
+	
+	# Estructura de peones
+	DOUBLED_PENALTY = 15
+	ISOLATED_PENALTY = 15  # por columna aislada
+	BACKWARD_PENALTY = 8
+	CONNECTED_BONUS = 5
+	PASSED_BONUS = [0, 10, 20, 35, 60, 100, 180, 0]  # idx=rank (0..7)
 	
 	# Tablas pieza-casilla (PST) simplificadas para blancas (A1=0 ... H8=63)
 	# Fuertemente simplificadas; sirven como demostración.
@@ -80,6 +101,28 @@ class Evaluator:
 		-30,-40,-40,-50,-50,-40,-40,-30,
 	]
 	
+	# Tablas de final: el rey se centraliza y los peones valen más cuanto más avanzan
+	PST_PAWN_EG = [
+		0,  0,  0,  0,  0,  0,  0,  0,
+		10, 10, 10, 10, 10, 10, 10, 10,
+		10, 10, 10, 10, 10, 10, 10, 10,
+		20, 20, 20, 20, 20, 20, 20, 20,
+		30, 30, 30, 30, 30, 30, 30, 30,
+		50, 50, 50, 50, 50, 50, 50, 50,
+		80, 80, 80, 80, 80, 80, 80, 80,
+		0,  0,  0,  0,  0,  0,  0,  0,
+	]
+	PST_KING_EG = [
+		-50,-30,-30,-30,-30,-30,-30,-50,
+		-30,-30,  0,  0,  0,  0,-30,-30,
+		-30,-10, 20, 30, 30, 20,-10,-30,
+		-30,-10, 30, 40, 40, 30,-10,-30,
+		-30,-10, 30, 40, 40, 30,-10,-30,
+		-30,-10, 20, 30, 30, 20,-10,-30,
+		-30,-20,-10,  0,  0,-10,-20,-30,
+		-50,-40,-30,-20,-20,-30,-40,-50,
+	]
+	
 	PST = {
 		chess.PAWN:   PST_PAWN,
 		chess.KNIGHT: PST_KNIGHT,
@@ -88,107 +131,558 @@ class Evaluator:
 		chess.QUEEN:  PST_QUEEN,
 		chess.KING:   PST_KING,
 	}
+	PST_EG = {
+		chess.PAWN:   PST_PAWN_EG,
+		chess.KNIGHT: PST_KNIGHT,
+		chess.BISHOP: PST_BISHOP,
+		chess.ROOK:   PST_ROOK,
+		chess.QUEEN:  PST_QUEEN,
+		chess.KING:   PST_KING_EG,
+	}
+	
+	# Fase de juego: 24 con todas las piezas menores/mayores, 0 con solo reyes y peones
+	PHASE_W = {chess.PAWN: 0, chess.KNIGHT: 1, chess.BISHOP: 1, chess.ROOK: 2, chess.QUEEN: 4, chess.KING: 0}
+	PHASE_MAX = 24
+	
+	# Valor material + PST con signo (blancas +, negras -), indexado por
+	# (color * 6 + piece_type - 1) * 64 + square. Se rellena en _build_psq().
+	PSQ_MG = []
+	PSQ_EG = []
+	
+	@classmethod
+	def _build_psq(cls):
+		cls.PSQ_MG = [0] * (2 * 6 * 64)
+		cls.PSQ_EG = [0] * (2 * 6 * 64)
+		for color in chess.COLORS:
+			for piece_type in chess.PIECE_TYPES:
+				base = cls.VAL[piece_type]
+				for sq in chess.SQUARES:
+					i = psq_index(color, piece_type, sq)
+					if color == chess.WHITE:
+						cls.PSQ_MG[i] = base + cls.PST[piece_type][sq]
+						cls.PSQ_EG[i] = base + cls.PST_EG[piece_type][sq]
+					else:
+						cls.PSQ_MG[i] = -(base + cls.PST[piece_type][chess.square_mirror(sq)])
+						cls.PSQ_EG[i] = -(base + cls.PST_EG[piece_type][chess.square_mirror(sq)])
+	
+	@classmethod
+	def taper(cls, mg: int, eg: int, phase: int) -> int:
+		phase = min(phase, cls.PHASE_MAX)
+		return (mg * phase + eg * (cls.PHASE_MAX - phase)) // cls.PHASE_MAX
 	
 	@classmethod
 	def _material_pst(cls, board: chess.Board) -> int:
-		score = 0
-		for piece_type, base in cls.VAL.items():
-			for sq in board.pieces(piece_type, chess.WHITE):
-				score += base + cls.PST[piece_type][sq]
-			for sq in board.pieces(piece_type, chess.BLACK):
-				score -= base + cls.PST[piece_type][chess.square_mirror(sq)]
-		return score
+		mg = eg = phase = 0
+		for color in chess.COLORS:
+			for piece_type in chess.PIECE_TYPES:
+				squares = board.pieces_mask(piece_type, color)
+				if not squares:
+					continue
+				offset = psq_index(color, piece_type, 0)
+				for sq in chess.scan_forward(squares):
+					mg += cls.PSQ_MG[offset + sq]
+					eg += cls.PSQ_EG[offset + sq]
+					phase += cls.PHASE_W[piece_type]
+		return cls.taper(mg, eg, phase)
 		
 	@classmethod
 	def _mobility(cls, board: chess.Board) -> int:
 		# Diferencia de movilidad (blancas - negras)
-		if board.turn == chess.WHITE:
-			w = board.legal_moves.count()
-			board.push(chess.Move.null())
-			b = board.legal_moves.count()
-			board.pop()
-		else:
-			b = board.legal_moves.count()
-			board.push(chess.Move.null())
-			w = board.legal_moves.count()
+		if cls.MOBILITY_MODE == 'exact':
+			return cls._mobility_exact(board)
+		return cls._mobility_fast(board)
+	
+	@classmethod
+	def _mobility_exact(cls, board: chess.Board) -> int:
+		# Movimientos legales de ambos bandos (el rival vía movimiento nulo).
+		# En jaque el bando que mueve cuenta sus evasiones; tras el movimiento
+		# nulo el rival podría "capturar" al rey, y esa jugada no se cuenta.
+		own = board.legal_moves.count()
+		king = board.king(board.turn) if board.is_check() else None
+		board.push(chess.Move.null())
+		try:
+			if king is None:
+				other = board.legal_moves.count()
+			else:
+				other = sum(1 for move in board.legal_moves if move.to_square != king)
+		finally:
 			board.pop()
+		w, b = (own, other) if board.turn == chess.WHITE else (other, own)
 		return cls.MOBILITY_W * (w - b)
+	
+	@classmethod
+	def _mobility_fast(cls, board: chess.Board) -> int:
+		# Casillas atacadas por cada pieza menor/mayor que no estén ocupadas por
+		# piezas propias ni atacadas por peones rivales, ponderadas por tipo.
+		not_a, not_h = ~chess.BB_FILE_A, ~chess.BB_FILE_H
+		white = board.occupied_co[chess.WHITE]
+		black = board.occupied_co[chess.BLACK]
+		white_pawns = board.pawns & white
+		black_pawns = board.pawns & black
+		white_pawn_attacks = (((white_pawns << 7) & not_h) | ((white_pawns << 9) & not_a)) & chess.BB_ALL
+		black_pawn_attacks = ((black_pawns >> 7) & not_a) | ((black_pawns >> 9) & not_h)
+		white_area = ~(white | black_pawn_attacks)
+		black_area = ~(black | white_pawn_attacks)
+	
+		score = 0
+		for piece_type, weight in cls.MOBILITY_PIECE_W.items():
+			pieces = board.pieces_mask(piece_type, chess.WHITE)
+			for sq in chess.scan_forward(pieces):
+				score += weight * chess.popcount(board.attacks_mask(sq) & white_area)
+			pieces = board.pieces_mask(piece_type, chess.BLACK)
+			for sq in chess.scan_forward(pieces):
+				score -= weight * chess.popcount(board.attacks_mask(sq) & black_area)
+		return score
 		
 	@staticmethod
-	def _count_file_pawns(board: chess.Board, color) -> list:
-		counts = [0]*8
-		for sq in board.pieces(chess.PAWN, color):
-			counts[chess.square_file(sq)] += 1
-		return counts
-		
+	def _north_fill(bb: int) -> int:
+		bb |= bb << 8
+		bb |= bb << 16
+		bb |= bb << 32
+		return bb & chess.BB_ALL
+	
+	@staticmethod
+	def _south_fill(bb: int) -> int:
+		bb |= bb >> 8
+		bb |= bb >> 16
+		bb |= bb >> 32
+		return bb
+	
 	@classmethod
-	def _pawn_structure(cls, board: chess.Board) -> int:
+	def _pawn_terms(cls, own: int, enemy: int) -> int:
+		"""
+		Pawn structure score for `own` pawns advancing north against `enemy` pawns.
+		Black is scored by flipping both bitboards vertically.
+		"""
+		if not own:
+			return 0
+		not_a, not_h = ~chess.BB_FILE_A, ~chess.BB_FILE_H
 		score = 0
-		# Dobles y aislados
-		for color, sign in ((chess.WHITE, +1), (chess.BLACK, -1)):
-			files = cls._count_file_pawns(board, color)
-			# Dobles
-			for c in files:
-				if c > 1:
-					score += sign * (-15 * (c - 1))
-			# Aislados
-			for f, c in enumerate(files):
-				if c == 0:
-					continue
-				left = files[f-1] if f-1 >= 0 else 0
-				right = files[f+1] if f+1 <= 7 else 0
-				if left == 0 and right == 0:
-					score += sign * (-15)  # penalización simple
-					
-		# Pasados (bonus por avance)
-		passed_bonus = [0, 10, 20, 35, 60, 100, 180, 0]  # idx=rank (0..7)
-		for sq in board.pieces(chess.PAWN, chess.WHITE):
-			f = chess.square_file(sq)
-			r = chess.square_rank(sq)
-			blockers = []
-			for df in (-1, 0, 1):
-				ff = f + df
-				if 0 <= ff < 8:
-					for rr in range(r+1, 8):
-						blockers.append(chess.square(ff, rr))
-			if not any(board.piece_at(s) == chess.Piece(chess.PAWN, chess.BLACK) for s in blockers):
-				score += passed_bonus[r]
-		for sq in board.pieces(chess.PAWN, chess.BLACK):
-			f = chess.square_file(sq)
-			r = chess.square_rank(sq)
-			blockers = []
-			for df in (-1, 0, 1):
-				ff = f + df
-				if 0 <= ff < 8:
-					for rr in range(0, r):
-						blockers.append(chess.square(ff, rr))
-			if not any(board.piece_at(s) == chess.Piece(chess.PAWN, chess.WHITE) for s in blockers):
-				score -= passed_bonus[7-r]
+	
+		# Columnas ocupadas proyectadas sobre la fila 1 y extendidas a columna completa
+		files = cls._south_fill(own) & chess.BB_RANK_1
+		file_span = cls._north_fill(files)
+		neighbours = ((files << 1) & not_a) | ((files >> 1) & not_h)
+	
+		# Dobles: cada peón extra en una columna
+		score -= cls.DOUBLED_PENALTY * (chess.popcount(own) - chess.popcount(files))
+	
+		# Aislados: columnas con peones sin peones propios en columnas vecinas
+		isolated_files = files & ~neighbours
+		score -= cls.ISOLATED_PENALTY * chess.popcount(isolated_files)
+	
+		# Pasados: ningún peón rival delante en la misma columna o en las vecinas
+		enemy_span = cls._south_fill(enemy >> 8)
+		blocked = enemy_span | ((enemy_span << 1) & not_a) | ((enemy_span >> 1) & not_h)
+		for sq in chess.scan_forward(own & ~blocked):
+			score += cls.PASSED_BONUS[sq >> 3]
+	
+		# Retrasados: sin apoyo posible de peones vecinos desde atrás y con la
+		# casilla de avance atacada por un peón rival (los aislados ya penalizan)
+		own_span = cls._north_fill(own)
+		support = ((own_span << 1) & not_a) | ((own_span >> 1) & not_h)
+		enemy_attacks = ((enemy >> 7) & not_a) | ((enemy >> 9) & not_h)
+		backward = own & ~support & ~cls._north_fill(isolated_files) & (enemy_attacks >> 8)
+		score -= cls.BACKWARD_PENALTY * chess.popcount(backward)
+	
+		# Conectados: defendidos por otro peón o con un peón al lado
+		defended = own & ((((own << 7) & not_h) | ((own << 9) & not_a)) & chess.BB_ALL)
+		phalanx = own & (((own << 1) & not_a) | ((own >> 1) & not_h))
+		score += cls.CONNECTED_BONUS * chess.popcount(defended | phalanx)
+		return score
+	
+	@classmethod
+	def _pawn_structure(cls, board: chess.Board) -> int:
+		white = board.pawns & board.occupied_co[chess.WHITE]
+		black = board.pawns & board.occupied_co[chess.BLACK]
+		cache = cls.pawn_cache
+		if cache is not None:
+			key = white | (black << 64)  # solo los peones: se repite mucho más que la posición
+			score = cache.get(key)
+			if score is not None:
+				return score
+		score = (cls._pawn_terms(white, black)
+			- cls._pawn_terms(chess.flip_vertical(black), chess.flip_vertical(white)))
+		if cache is not None:
+			cache.put(key, score)
 		return score
 		
 	@classmethod
-	def evaluate_board(cls, board: chess.Board) -> int:
+	def evaluate_board(cls, board: chess.Board, state: "EvalState" = None, key: int = None) -> int:
+		"""
+		Static evaluation from White's perspective. If `state` tracks `board`,
+		the material + PST term is read from it instead of being recomputed.
+		Results are kept in `eval_cache`, shared by every AI of the process,
+		under the Zobrist `key` of `board` (computed here when not given).
+		"""
+		cache = cls.eval_cache
+		if cache is not None:
+			if key is None:
+				key = zobrist_hash(board)
+			score = cache.get(key)
+			if score is not None:
+				return score
+		score = cls._evaluate_uncached(board, state)
+		if cache is not None:
+			cache.put(key, score)
+		return score
+	
+	@classmethod
+	def _evaluate_uncached(cls, board: chess.Board, state: "EvalState" = None) -> int:
 		# Mate
 		if board.is_checkmate():
 			return -cls.MATE if board.turn == chess.WHITE else cls.MATE
 		score = 0
-		score += cls._material_pst(board)
+		score += state.material_pst() if state is not None else cls._material_pst(board)
 		score += cls._mobility(board)
 		score += cls._pawn_structure(board)
 		if board.is_check():
 			score += cls.CHECK_BONUS if board.turn == chess.BLACK else -cls.CHECK_BONUS
 		return int(score)
+	
+	# ------------------ CACHES ------------------ #
+	# Evaluación por posición y estructura de peones por pareja de bitboards de
+	# peones. Son atributos de clase: todas las IAs del proceso los comparten.
+	EVAL_CACHE_SIZE = 1 << 18
+	PAWN_CACHE_SIZE = 1 << 14
+	CACHE_POLICY = 'clock'  # 'clock' o 'lru' (ver Data_structure/Cache.py)
+	eval_cache = None
+	pawn_cache = None
+	
+	@classmethod
+	def configure_cache(cls, eval_size: int = None, pawn_size: int = None, policy: str = None):
+		"""
+		Rebuild both caches (entries are dropped). A size of 0 disables that
+		cache. Must also be called after changing any evaluation weight, since
+		cached scores were computed with the old ones.
+		"""
+		if eval_size is not None:
+			cls.EVAL_CACHE_SIZE = eval_size
+		if pawn_size is not None:
+			cls.PAWN_CACHE_SIZE = pawn_size
+		if policy is not None:
+			cls.CACHE_POLICY = policy
+		cls.eval_cache = make_cache(cls.EVAL_CACHE_SIZE, cls.CACHE_POLICY)
+		cls.pawn_cache = make_cache(cls.PAWN_CACHE_SIZE, cls.CACHE_POLICY)
+	
+	@classmethod
+	def cache_counters(cls) -> tuple:
+		"""(eval hits, eval probes, pawn hits, pawn probes) since the caches were built."""
+		counters = []
+		for cache in (cls.eval_cache, cls.pawn_cache):
+			if cache is None:
+				counters += [0, 0]
+			else:
+				counters += [cache.hits, cache.hits + cache.misses]
+		return tuple(counters)
+	
+	# ------------------ BATCH (NumPy) ------------------ #
+	_np_tables = None
+	BATCH_MIN_SIZE = 32  # por debajo, el coste fijo de NumPy supera al camino escalar
+
+	# (desplazamiento, máscara de columnas válidas tras el desplazamiento)
+	_KNIGHT_STEPS = (
+		(17, ~chess.BB_FILE_A), (15, ~chess.BB_FILE_H),
+		(10, ~(chess.BB_FILE_A | chess.BB_FILE_B)), (6, ~(chess.BB_FILE_G | chess.BB_FILE_H)),
+		(-6, ~(chess.BB_FILE_A | chess.BB_FILE_B)), (-10, ~(chess.BB_FILE_G | chess.BB_FILE_H)),
+		(-15, ~chess.BB_FILE_A), (-17, ~chess.BB_FILE_H),
+	)
+	_ORTHOGONAL_RAYS = ((8, chess.BB_ALL), (-8, chess.BB_ALL), (1, ~chess.BB_FILE_A), (-1, ~chess.BB_FILE_H))
+	_DIAGONAL_RAYS = ((9, ~chess.BB_FILE_A), (7, ~chess.BB_FILE_H), (-7, ~chess.BB_FILE_A), (-9, ~chess.BB_FILE_H))
+
+	@classmethod
+	def _batch_tables(cls):
+		if cls._np_tables is None:
+			phase_w = [cls.PHASE_W[pt] for pt in chess.PIECE_TYPES] * 2
+			passed = np.zeros(64, dtype=np.int64)
+			for sq in chess.SQUARES:
+				passed[sq] = cls.PASSED_BONUS[chess.square_rank(sq)]
+			cls._np_tables = (
+				np.array(cls.PSQ_MG, dtype=np.int64),
+				np.array(cls.PSQ_EG, dtype=np.int64),
+				np.array(phase_w, dtype=np.int64),
+				passed,
+			)
+		return cls._np_tables
+
+	@staticmethod
+	def _np_popcount(bb):
+		if hasattr(np, 'bitwise_count'):
+			return np.bitwise_count(bb).astype(np.int64)
+		bits = np.unpackbits(bb.astype('<u8').view(np.uint8).reshape(bb.shape + (8,)), axis=-1)
+		return bits.sum(axis=-1, dtype=np.int64)
+
+	@staticmethod
+	def _np_shift(bb, shift: int, mask: int):
+		if shift > 0:
+			return (bb << np.uint64(shift)) & np.uint64(mask & chess.BB_ALL)
+		return (bb >> np.uint64(-shift)) & np.uint64(mask & chess.BB_ALL)
+
+	@classmethod
+	def _np_ray_attacks(cls, sliders, empty, shift: int, mask: int):
+		"""Kogge-Stone occluded fill: squares hit by `sliders` moving along one direction."""
+		sh = cls._np_shift
+		empty = empty & np.uint64(mask & chess.BB_ALL)
+		sliders = sliders | (empty & sh(sliders, shift, mask))
+		empty = empty & sh(empty, shift, mask)
+		sliders = sliders | (empty & sh(sliders, 2 * shift, chess.BB_ALL))
+		empty = empty & sh(empty, 2 * shift, chess.BB_ALL)
+		sliders = sliders | (empty & sh(sliders, 4 * shift, chess.BB_ALL))
+		return sh(sliders, shift, mask)
+
+	@classmethod
+	def _np_attacks(cls, pieces: dict, occupied):
+		"""
+		Attack sets per piece type for one side, one direction at a time. Rays of
+		the same piece type in the same direction never overlap (the rear slider
+		stops on the front one), so summing popcounts over directions equals
+		summing them over pieces.
+		Yields (piece_type, attacked_bitboards).
+		"""
+		sh = cls._np_shift
+		empty = ~occupied
+		for shift, mask in cls._KNIGHT_STEPS:
+			yield chess.KNIGHT, sh(pieces[chess.KNIGHT], shift, mask)
+		for piece_type, rays in ((chess.BISHOP, cls._DIAGONAL_RAYS), (chess.ROOK, cls._ORTHOGONAL_RAYS),
+								 (chess.QUEEN, cls._DIAGONAL_RAYS + cls._ORTHOGONAL_RAYS)):
+			for shift, mask in rays:
+				yield piece_type, cls._np_ray_attacks(pieces[piece_type], empty, shift, mask)
+
+	@classmethod
+	def _pawn_terms_batch(cls, own, enemy, passed_table):
+		"""NumPy version of _pawn_terms over arrays of uint64 bitboards."""
+		u = np.uint64
+		not_a, not_h = u(~chess.BB_FILE_A & chess.BB_ALL), u(~chess.BB_FILE_H & chess.BB_ALL)
+		popcount = cls._np_popcount
+
+		def north_fill(bb):
+			bb = bb | (bb << u(8))
+			bb = bb | (bb << u(16))
+			return bb | (bb << u(32))
+
+		def south_fill(bb):
+			bb = bb | (bb >> u(8))
+			bb = bb | (bb >> u(16))
+			return bb | (bb >> u(32))
+
+		files = south_fill(own) & u(chess.BB_RANK_1)
+		neighbours = ((files << u(1)) & not_a) | ((files >> u(1)) & not_h)
+		score = -cls.DOUBLED_PENALTY * (popcount(own) - popcount(files))
+
+		isolated_files = files & ~neighbours
+		score -= cls.ISOLATED_PENALTY * popcount(isolated_files)
+
+		enemy_span = south_fill(enemy >> u(8))
+		blocked = enemy_span | ((enemy_span << u(1)) & not_a) | ((enemy_span >> u(1)) & not_h)
+		passed = own & ~blocked
+		passed_bits = np.unpackbits(passed.astype('<u8').view(np.uint8).reshape(-1, 8), axis=1, bitorder='little')
+		score += passed_bits @ passed_table
+
+		own_span = north_fill(own)
+		support = ((own_span << u(1)) & not_a) | ((own_span >> u(1)) & not_h)
+		enemy_attacks = ((enemy >> u(7)) & not_a) | ((enemy >> u(9)) & not_h)
+		backward = own & ~support & ~north_fill(isolated_files) & (enemy_attacks >> u(8))
+		score -= cls.BACKWARD_PENALTY * popcount(backward)
+
+		defended = own & (((own << u(7)) & not_h) | ((own << u(9)) & not_a))
+		phalanx = own & (((own << u(1)) & not_a) | ((own >> u(1)) & not_h))
+		score += cls.CONNECTED_BONUS * popcount(defended | phalanx)
+		return score
+
+	@classmethod
+	def evaluate_batch(cls, boards, keys=None) -> list:
+		"""
+		Evaluate many boards at once. Material, PST, pawn structure, fast
+		mobility and check detection are computed with NumPy over the packed
+		bitboards of the whole batch; only positions in check fall back to a
+		per-board mate test. Returns exactly the same scores as evaluate_board,
+		in the same order. `keys` are the Zobrist keys of the boards, if known.
+		"""
+		boards = list(boards)
+		if keys is None:
+			keys = [None] * len(boards)
+		if np is None or len(boards) < cls.BATCH_MIN_SIZE:
+			return [cls.evaluate_board(board, key=key) for board, key in zip(boards, keys)]
+		cache = cls.eval_cache
+		if cache is None:
+			return cls._evaluate_batch_np(boards)
+		# Solo se calculan (y se guardan) las posiciones que no están en la caché
+		keys = [zobrist_hash(board) if key is None else key for board, key in zip(boards, keys)]
+		result = [cache.get(key) for key in keys]
+		missing = [i for i, score in enumerate(result) if score is None]
+		if len(missing) < cls.BATCH_MIN_SIZE:
+			scores = [cls._evaluate_uncached(boards[i]) for i in missing]
+		else:
+			scores = cls._evaluate_batch_np([boards[i] for i in missing])
+		for i, score in zip(missing, scores):
+			result[i] = score
+			cache.put(keys[i], score)
+		return result
+	
+	@classmethod
+	def _evaluate_batch_np(cls, boards: list) -> list:
+		psq_mg, psq_eg, phase_w, passed_table = cls._batch_tables()
+		n = len(boards)
+		popcount = cls._np_popcount
+
+		raw = np.array(
+			[(b.pawns, b.knights, b.bishops, b.rooks, b.queens, b.kings,
+			  b.occupied_co[chess.WHITE], b.occupied_co[chess.BLACK]) for b in boards],
+			dtype=np.uint64,
+		)
+		turn = np.array([b.turn for b in boards], dtype=bool)
+		white, black = raw[:, 6], raw[:, 7]
+		occupied = white | black
+		# (N, 12) en el mismo orden que psq_index: blancas P..K, negras P..K
+		planes = np.concatenate((raw[:, :6] & white[:, None], raw[:, :6] & black[:, None]), axis=1)
+
+		# Material + PST con interpolación por fase
+		bits = np.unpackbits(planes.astype('<u8').view(np.uint8).reshape(n, 12 * 8), axis=1, bitorder='little')
+		mg = bits @ psq_mg
+		eg = bits @ psq_eg
+		phase = np.minimum(popcount(planes) @ phase_w, cls.PHASE_MAX)
+		scores = (mg * phase + eg * (cls.PHASE_MAX - phase)) // cls.PHASE_MAX
+
+		# Estructura de peones (negras: tableros volteados verticalmente)
+		white_pawns, black_pawns = planes[:, 0], planes[:, 6]
+		scores += cls._pawn_terms_batch(white_pawns, black_pawns, passed_table)
+		scores -= cls._pawn_terms_batch(black_pawns.byteswap(), white_pawns.byteswap(), passed_table)
+
+		# Ataques por bando: movilidad rápida y detección de jaque
+		sh = cls._np_shift
+		pawn_attacks = {
+			chess.WHITE: sh(white_pawns, 7, ~chess.BB_FILE_H) | sh(white_pawns, 9, ~chess.BB_FILE_A),
+			chess.BLACK: sh(black_pawns, -7, ~chess.BB_FILE_A) | sh(black_pawns, -9, ~chess.BB_FILE_H),
+		}
+		attacked = {}
+		mobility = np.zeros(n, dtype=np.int64)
+		for color, offset, own, sign in ((chess.WHITE, 0, white, 1), (chess.BLACK, 6, black, -1)):
+			pieces = {pt: planes[:, offset + pt - 1] for pt in chess.PIECE_TYPES}
+			area = ~(own | pawn_attacks[not color])
+			king = pieces[chess.KING]
+			attacks = pawn_attacks[color] | sh(king, 8, chess.BB_ALL) | sh(king, -8, chess.BB_ALL)
+			for shift, mask in cls._DIAGONAL_RAYS + cls._ORTHOGONAL_RAYS[2:]:
+				attacks = attacks | sh(king, shift, mask)
+			for piece_type, targets in cls._np_attacks(pieces, occupied):
+				attacks = attacks | targets
+				mobility += sign * cls.MOBILITY_PIECE_W[piece_type] * popcount(targets & area)
+			attacked[color] = attacks
+		if cls.MOBILITY_MODE == 'fast':
+			scores += mobility
+
+		own_king = np.where(turn, planes[:, 5], planes[:, 11])
+		enemy_attacks = np.where(turn, attacked[chess.BLACK], attacked[chess.WHITE])
+		in_check = (own_king & enemy_attacks) != 0
+		scores += np.where(in_check, np.where(turn, -cls.CHECK_BONUS, cls.CHECK_BONUS), 0)
+
+		result = scores.tolist()
+		for i in np.flatnonzero(in_check).tolist():
+			if boards[i].is_checkmate():
+				result[i] = -cls.MATE if boards[i].turn == chess.WHITE else cls.MATE
+		if cls.MOBILITY_MODE != 'fast':
+			for i, board in enumerate(boards):
+				if not in_check[i] or result[i] not in (cls.MATE, -cls.MATE):
+					result[i] += cls._mobility(board)
+		return result
+
+
+Evaluator._build_psq()
+Evaluator.configure_cache()
+
+
+class EvalState:
+	"""
+	Material + piece-square accumulators (middlegame, endgame, phase) kept in
+	sync with a board. Call `make(board, move)` right before `board.push(move)`
+	and `unmake()` right after `board.pop()`.
+	"""
+
+	def __init__(self, board: chess.Board = None):
+		self._stack = []
+		self.mg = self.eg = self.phase = 0
+		if board is not None:
+			self.reset(board)
+
+	def reset(self, board: chess.Board):
+		self._stack = []
+		self.mg = self.eg = self.phase = 0
+		for color in chess.COLORS:
+			for piece_type in chess.PIECE_TYPES:
+				for sq in chess.scan_forward(board.pieces_mask(piece_type, color)):
+					self._add(color, piece_type, sq)
+
+	def material_pst(self) -> int:
+		return Evaluator.taper(self.mg, self.eg, self.phase)
+
+	def _add(self, color, piece_type, sq):
+		i = psq_index(color, piece_type, sq)
+		self.mg += Evaluator.PSQ_MG[i]
+		self.eg += Evaluator.PSQ_EG[i]
+		self.phase += Evaluator.PHASE_W[piece_type]
+
+	def _remove(self, color, piece_type, sq):
+		i = psq_index(color, piece_type, sq)
+		self.mg -= Evaluator.PSQ_MG[i]
+		self.eg -= Evaluator.PSQ_EG[i]
+		self.phase -= Evaluator.PHASE_W[piece_type]
+
+	def make(self, board: chess.Board, move: chess.Move):
+		self._stack.append((self.mg, self.eg, self.phase))
+		if not move:
+			return
+		from_sq, to_sq = move.from_square, move.to_square
+		color = board.turn
+		piece_type = board.piece_type_at(from_sq)
+
+		if piece_type == chess.KING and board.is_castling(move):
+			rank = chess.square_rank(from_sq)
+			kingside = board.is_kingside_castling(move)
+			self._remove(color, chess.KING, from_sq)
+			self._add(color, chess.KING, chess.square(6 if kingside else 2, rank))
+			self._remove(color, chess.ROOK, chess.square(7 if kingside else 0, rank))
+			self._add(color, chess.ROOK, chess.square(5 if kingside else 3, rank))
+			return
+
+		captured_type = board.piece_type_at(to_sq)
+		if captured_type:
+			self._remove(not color, captured_type, to_sq)
+		elif piece_type == chess.PAWN and to_sq == board.ep_square:
+			self._remove(not color, chess.PAWN, to_sq - 8 if color == chess.WHITE else to_sq + 8)
+		self._remove(color, piece_type, from_sq)
+		self._add(color, move.promotion or piece_type, to_sq)
+
+	def unmake(self):
+		self.mg, self.eg, self.phase = self._stack.pop()
 
 
 class HeuristicChessAI(ChessAI):
-    def select_move(self, board: chess.Board, color: chess.Color):
+    def select_move(self, board: chess.Board, color: chess.Color) -> SearchStats:
+        stats = self.new_stats()
+        move = self.book_move(board)
+        if move is not None:
+            stats.book = True
+            return self.finish_stats(stats, move)
+        # Todas las posiciones hijas se puntúan en una sola llamada por lotes
+        moves = list(board.legal_moves)
+        children = []
+        keys = []
+        root_key = zobrist_hash(board)
+        for move in moves:
+            keys.append(update_hash(root_key, board, move))  # clave de la caché de evaluación
+            child = board.copy(stack=False)
+            child.push(move)
+            children.append(child)
+        start = time.perf_counter()
+        scores = Evaluator.evaluate_batch(children, keys)
+        stats.eval_time = time.perf_counter() - start
+        stats.eval_calls = stats.nodes = len(children)
         best_score = None
         best_move = None
-        for move in board.legal_moves:
-            board.push(move)
-            score = Evaluator.evaluate_board(board, color)
-            board.pop()
+        for move, score in zip(moves, scores):
+            if color == chess.BLACK:
+                score = -score
             if best_score is None or score > best_score:
                 best_score = score
                 best_move = move
-        return best_move
+        stats.depth, stats.score = 1, None if best_score is None else float(best_score)
+        return self.finish_stats(stats, best_move)
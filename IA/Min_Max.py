@@ -1,6 +1,10 @@
-from IA_interfaze import ChessAI
+from IA_interfaze import ChessAI, SearchLimits, SearchStats
 import chess
-from IA.Heuristica import Evaluator
+import time
+from IA.Heuristica import Evaluator, EvalState
+from IA.Zobrist import ZobristHasher
+from IA.MoveOrdering import MoveOrderer
+from IA.Bitbase import Bitbases
 
 
 class MinMaxChessAI(ChessAI):
@@ -8,24 +12,97 @@ class MinMaxChessAI(ChessAI):
     Chess AI using Minimax with Alpha-Beta pruning.
     """
 
-    def __init__(self, depth: int = 3):
+    MAX_DEPTH = 64
+    DELTA_MARGIN = 200  # margen de la poda delta en quiescencia (centipeones)
+
+    def __init__(self, depth: int = 3, time_limit: float = None, node_limit: int = None,
+                 quiescence: bool = True, qnode_cap: int = 2000, use_bitbases: bool = True):
         self.depth = depth
+        self.quiescence = quiescence
+        self.qnode_cap = qnode_cap
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self._limits = SearchLimits()
+        self.stats = SearchStats()  # registro de la búsqueda en curso
         self._nodes_searched = 0
+        self._qnodes_searched = 0
+        self._qnode_budget = 0
+        self._eval_state = EvalState()
+        self._zobrist = ZobristHasher()  # solo como clave de la caché de evaluación (no hay TT)
+        self.move_orderer = MoveOrderer()
+        self.bitbases = Bitbases.load_default() if use_bitbases else None  # None si no se generaron
+        self._root_ply = 0
 
     # ------------------ PUBLIC METHOD ------------------ #
-    def select_move(self, board: chess.Board, color: chess.Color) -> chess.Move:
+    def select_move(self, board: chess.Board, color: chess.Color,
+                    time_limit: float = None, node_limit: int = None,
+                    limits: SearchLimits = None) -> SearchStats:
         """
         Select the best move for the given position using Minimax with Alpha-Beta pruning.
+        With a time (seconds) or node budget it runs iterative deepening and returns
+        the best move of the last completed depth; otherwise it searches `self.depth`.
+        `limits` replaces both budgets (e.g. to stop the search from another thread).
         """
+        stats = self.stats = self.new_stats()
+        move = self.book_move(board)
+        if move is not None:
+            stats.book = True
+            return self.finish_stats(stats, move)
         self._nodes_searched = 0
+        self._qnodes_searched = 0
+        self._limits = limits or SearchLimits(
+            time_limit if time_limit is not None else self.time_limit,
+            node_limit if node_limit is not None else self.node_limit,
+        )
+        self._eval_state.reset(board)
+        self._zobrist.reset(board)
+        self.move_orderer.age()
+        self._root_ply = len(board.move_stack)
+
+        if not self._limits.active:
+            with stats.phase("search"):
+                best_move, stats.score = self._search_root(board, self.depth, color)
+            stats.depth = self.depth
+            return self._finish(best_move)
+
+        best_move = None
+        for depth in range(1, min(self.MAX_DEPTH, self._limits.max_depth or self.MAX_DEPTH) + 1):
+            with stats.phase(f"depth {depth}"):
+                move, score = self._search_root(board, depth, color, best_move)
+            if self._limits.stopped:
+                break  # iteración incompleta: se descarta
+            best_move, stats.depth, stats.score = move, depth, score
+            if self.on_info is not None:
+                stats.nodes, stats.qnodes, stats.pv = self._nodes_searched, self._qnodes_searched, [move]
+                stats.elapsed = self._limits.elapsed()
+                self.on_info(stats)
+            if move is None or abs(score) >= Evaluator.MATE or not self._limits.can_start_iteration():
+                break
+
+        if best_move is None:
+            # Ni siquiera la profundidad 1 terminó: cualquier jugada legal es mejor que ninguna
+            best_move = next(iter(self._get_ordered_moves(board)), None)
+        return self._finish(best_move)
+
+    def _finish(self, best_move: chess.Move) -> SearchStats:
+        self.stats.nodes = self._nodes_searched
+        self.stats.qnodes = self._qnodes_searched
+        return self.finish_stats(self.stats, best_move)
+
+    def _search_root(self, board, depth, color, first_move=None):
         best_score = float('-inf')
         best_move = None
         alpha, beta = float('-inf'), float('inf')
 
-        for move in self._get_ordered_moves(board):
-            board.push(move)
-            score = self._minmax(board, self.depth - 1, alpha, beta, maximizing=False, color=color)
-            board.pop()
+        moves = self._get_ordered_moves(board, first_move)
+        if self.bitbases is not None and chess.popcount(board.occupied) <= Bitbases.MAX_PIECES:
+            moves = self.bitbases.filter_root_moves(board, moves)
+        for move in moves:
+            self._make(board, move)
+            score = self._minmax(board, depth - 1, alpha, beta, maximizing=False, color=color)
+            self._unmake(board)
+            if self._limits.stopped:
+                return best_move, best_score
 
             if score > best_score:
                 best_score = score
@@ -33,15 +110,30 @@ class MinMaxChessAI(ChessAI):
 
             alpha = max(alpha, best_score)  # update pruning window
 
-        return best_move, self._nodes_searched
+        return best_move, best_score
 
     # ------------------ CORE SEARCH ------------------ #
     def _minmax(self, board, depth, alpha, beta, maximizing, color) -> float:
         """
         Recursive minimax search with alpha-beta pruning.
         """
+        if self._limits.exceeded(self._nodes_searched + self._qnodes_searched):
+            return 0
+        # Final con bitbase: las tablas se cortan en O(1); un final ganado se sigue
+        # buscando (el bitbase no da distancia al mate) y se puntúa así en el horizonte
+        if (self.bitbases is not None and chess.popcount(board.occupied) <= Bitbases.MAX_PIECES
+                and not board.is_game_over()):
+            score = self.bitbases.search_score(board)
+            if score is not None and (score == 0 or depth <= 0):
+                return score if board.turn == color else -score
         if self._is_terminal(board, depth):
-            return self._evaluate(board, color)
+            if depth > 0 or not self.quiescence or board.is_game_over():
+                return self._evaluate(board, color)
+            # Horizonte: la quiescencia trabaja desde el bando que mueve
+            self._qnode_budget = self._qnodes_searched + self.qnode_cap
+            if maximizing:
+                return self._quiesce(board, alpha, beta, color)
+            return -self._quiesce(board, -beta, -alpha, color)
 
         self._nodes_searched += 1
         if maximizing:
@@ -53,43 +145,94 @@ class MinMaxChessAI(ChessAI):
     def _maximize(self, board, depth, alpha, beta, color) -> float:
         max_eval = float('-inf')
         for move in self._get_ordered_moves(board):
-            board.push(move)
+            self._make(board, move)
             eval_score = self._minmax(board, depth - 1, alpha, beta, maximizing=False, color=color)
-            board.pop()
+            self._unmake(board)
+            if self._limits.stopped:
+                return 0
 
             max_eval = max(max_eval, eval_score)
             alpha = max(alpha, eval_score)
 
             if beta <= alpha:
+                self.move_orderer.record_cutoff(board, move, len(board.move_stack) - self._root_ply, depth)
                 break
         return max_eval
 
     def _minimize(self, board, depth, alpha, beta, color) -> float:
         min_eval = float('inf')
         for move in self._get_ordered_moves(board):
-            board.push(move)
+            self._make(board, move)
             eval_score = self._minmax(board, depth - 1, alpha, beta, maximizing=True, color=color)
-            board.pop()
+            self._unmake(board)
+            if self._limits.stopped:
+                return 0
 
             min_eval = min(min_eval, eval_score)
             beta = min(beta, eval_score)
 
-            if beta <= alpha: 
+            if beta <= alpha:
+                self.move_orderer.record_cutoff(board, move, len(board.move_stack) - self._root_ply, depth)
                 break
         return min_eval
 
+    def _quiesce(self, board, alpha, beta, color) -> float:
+        """
+        Capture/promotion-only search with stand-pat, delta pruning and a node cap
+        per leaf. Scores are from the side to move; `color` is the root player.
+        """
+        self._qnodes_searched += 1
+        if self._limits.exceeded(self._nodes_searched + self._qnodes_searched):
+            return 0
+
+        stand_pat = self._evaluate(board, color)
+        if board.turn != color:
+            stand_pat = -stand_pat
+        if stand_pat >= beta or self._qnodes_searched >= self._qnode_budget:
+            return stand_pat
+        alpha = max(alpha, stand_pat)
+
+        for move in self.move_orderer.order_noisy(board):
+            # Poda delta: ni ganando la pieza capturada (más margen) se alcanza alpha
+            if not move.promotion:
+                victim = board.piece_type_at(move.to_square) or chess.PAWN
+                if stand_pat + Evaluator.VAL[victim] + self.DELTA_MARGIN <= alpha:
+                    continue
+            self._make(board, move)
+            score = -self._quiesce(board, -beta, -alpha, color)
+            self._unmake(board)
+            if self._limits.stopped:
+                return 0
+            if score >= beta:
+                return score
+            alpha = max(alpha, score)
+        return alpha
+
     # ------------------ HELPERS ------------------ #
+    def _make(self, board: chess.Board, move: chess.Move):
+        """Push a move keeping the Zobrist key and evaluation state in sync."""
+        self._zobrist.make(board, move)
+        self._eval_state.make(board, move)
+        board.push(move)
+
+    def _unmake(self, board: chess.Board):
+        board.pop()
+        self._zobrist.unmake()
+        self._eval_state.unmake()
+
     def _is_terminal(self, board: chess.Board, depth: int) -> bool:
         """Check if search should stop (depth or game end)."""
         return depth == 0 or board.is_game_over()
 
     def _evaluate(self, board: chess.Board, color: chess.Color) -> float:
         """Evaluate board from the perspective of the given color."""
-        score = Evaluator.evaluate_board(board)
+        stats = self.stats
+        start = time.perf_counter()
+        score = Evaluator.evaluate_board(board, self._eval_state, self._zobrist.key)
+        stats.eval_time += time.perf_counter() - start
+        stats.eval_calls += 1
         return score if color == chess.WHITE else -score
 
-    def _get_ordered_moves(self, board: chess.Board):
-        """Order moves to improve pruning (captures first)."""
-        moves = list(board.legal_moves)
-        moves.sort(key=lambda m: board.is_capture(m), reverse=True)
-        return moves
+    def _get_ordered_moves(self, board: chess.Board, first_move: chess.Move = None):
+        """Order moves to improve pruning (previous best move, MVV-LVA captures, killers, history)."""
+        return self.move_orderer.order(board, len(board.move_stack) - self._root_ply, first_move)
@@ -1,22 +1,44 @@
-from IA_interfaze import ChessAI
+from IA_interfaze import ChessAI, SearchStats, SearchLimits
 import chess
 import random
 import math
-from IA.Heuristica import Evaluator
+import time
+from IA.Zobrist import zobrist_hash, update_hash
+from IA.Rollout import RolloutEngine
+from Data_structure.TranspositionTable import TranspositionTable
+from array import array
+import multiprocessing
+
+encode_move = TranspositionTable.encode_move
+decode_move = TranspositionTable.decode_move
 
 class MCTSNode:
-    def __init__(self, board, parent=None, move=None, zobrist_hash=None):
-        self.board = board.copy()
+    """
+    Tree node without its own board: only the move that leads to it, its stats
+    and the legal moves not expanded yet (computed the first time the node is
+    reached). Moves are kept as 16-bit codes (`TranspositionTable.encode_move`)
+    and positions are rebuilt by replaying moves on a single board.
+    """
+
+    __slots__ = ('parent', 'move', 'children', 'untried', 'visits', 'wins', 'hash')
+
+    def __init__(self, parent=None, move=0, zobrist_hash=None):
         self.parent = parent
-        self.move = move
+        self.move = move  # código de la jugada que lleva a este nodo
         self.children = []
+        self.untried = None  # None: aún no se generaron las jugadas
         self.visits = 0
         self.wins = 0
         self.hash = zobrist_hash
 
+    def generate_moves(self, board):
+        """Cache the untried moves of this node (`board` is its position); none if the game is over."""
+        codes = [] if board.is_game_over() else [encode_move(move) for move in board.legal_moves]
+        codes.reverse()  # se expanden con pop() en el orden del generador
+        self.untried = array('H', codes)
 
     def is_fully_expanded(self):
-        return len(self.children) == len(list(self.board.legal_moves))
+        return self.untried is not None and not self.untried
 
     def best_child(self, c_param=1.4):
         choices_weights = [
@@ -25,99 +47,435 @@ class MCTSNode:
             for child in self.children
         ]
         return self.children[choices_weights.index(max(choices_weights))]
-    
-    
+
+
+class DAGNode:
+    """
+    Position node of the transposition-aware mode: one record per Zobrist key,
+    shared by every path that reaches the position. Node stats (`visits`,
+    `wins`, for the side that moved into the position) sum all paths; each
+    outgoing edge keeps its own move code, visits and wins in parallel arrays.
+    """
+
+    __slots__ = ('hash', 'untried', 'visits', 'wins', 'children', 'moves', 'edge_visits', 'edge_wins')
+
+    def __init__(self, zobrist_hash=None):
+        self.hash = zobrist_hash
+        self.untried = None
+        self.visits = 0
+        self.wins = 0
+        self.children = []
+        self.moves = array('H')
+        self.edge_visits = array('I')
+        self.edge_wins = array('d')
+
+    generate_moves = MCTSNode.generate_moves
+    is_fully_expanded = MCTSNode.is_fully_expanded
+
+    def add_edge(self, code, child):
+        self.children.append(child)
+        self.moves.append(code)
+        self.edge_visits.append(0)
+        self.edge_wins.append(0.0)
+        return len(self.children) - 1
+
+    def best_edge(self, c_param=1.4):
+        """UCT over the edges: shared value of the child position, exploration from the edge count."""
+        log_visits = math.log(max(sum(self.edge_visits), 1))
+        best_i, best_weight = 0, None
+        for i, child in enumerate(self.children):
+            n = self.edge_visits[i]
+            if n == 0:
+                return i
+            value = child.wins / child.visits if child.visits else self.edge_wins[i] / n
+            weight = value + c_param * (log_visits / n) ** 0.5
+            if best_weight is None or weight > best_weight:
+                best_i, best_weight = i, weight
+        return best_i
 
 
 class MonteCarloTreeSearchAI(ChessAI):
-    def __init__(self, n_simulations=100):
+    # Tamaño medio medido de un nodo con tracemalloc (Benchmark/mcts_memory.py), para max_bytes
+    NODE_BYTES = 300
+    DAG_NODE_BYTES = 600  # aristas en arrays + entrada del diccionario de posiciones
+    GC_KEEP = 0.9  # al llegar al presupuesto se liberan hojas hasta quedar en esta fracción
+    INFO_EVERY = 200  # simulaciones entre dos llamadas a on_info
+
+    def __init__(self, n_simulations=100, reuse_tree=True, workers=1, seed=None,
+                 rollout_policy='capture', dag=False, max_nodes=None, max_bytes=None):
         self.n_simulations = n_simulations
-        self.transposition_table = {}
-        self._init_zobrist()
-        self.top_n = 3  # número de mejores movimientos a considerar en cada simulación
+        self.reuse_tree = reuse_tree
+        self.dag = dag
+        node_bytes = self.DAG_NODE_BYTES if dag else self.NODE_BYTES
+        budgets = [b for b in (max_nodes, max_bytes and max_bytes // node_bytes) if b]
+        self.max_nodes = max(2, min(budgets)) if budgets else None
+        self.node_count = 0  # nodos vivos del árbol actual
+        self.evicted = 0  # nodos liberados por el presupuesto desde la creación
+        self._positions = {}  # modo DAG: clave Zobrist -> DAGNode
+        self.workers = max(1, workers)
+        self.rollout_policy = rollout_policy
+        self._rng = random.Random(seed)
+        self.rollout = RolloutEngine(rollout_policy, rng=self._rng)
+        self._pool = None
+        self._pool_stop = None  # Event compartido con los workers del pool (modo paralelo)
         self._nodes_searched = 0
+        self._root = None
+        self._root_ply = 0
+        self.reused_visits = 0  # visitas heredadas de la búsqueda anterior en la última jugada
+
+    def reset(self):
+        """Forget the tree kept between moves (e.g. before a new game)."""
+        self._root = None
+        self._root_ply = 0
+        self._positions = {}
+        self.node_count = 0
+
+    def tree_size(self) -> dict:
+        """Gauge of the tree kept in memory: live nodes and estimated bytes."""
+        node_bytes = self.DAG_NODE_BYTES if self.dag else self.NODE_BYTES
+        return {'nodes': self.node_count, 'bytes': self.node_count * node_bytes,
+                'max_nodes': self.max_nodes, 'evicted': self.evicted}
 
-    def select_move(self, board: chess.Board, color: chess.Color):
+    def close(self):
+        """Shut down the worker pool of the root-parallel mode."""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+            self._pool_stop = None
+
+    def select_move(self, board: chess.Board, color: chess.Color, limits: SearchLimits = None) -> SearchStats:
+        """
+        Run `n_simulations` from `board` and play the most visited move. With
+        `limits` the node limit counts simulations, a time limit or stop event
+        runs until they fire, and `stop()` ends the search after the current
+        simulation (in every worker in the root-parallel mode).
+        """
+        stats = self.new_stats()
+        move = self.book_move(board)
+        if move is not None:
+            stats.book = True
+            return self.finish_stats(stats, move)
+        if self.workers > 1:
+            return self._select_move_parallel(board, stats, limits)
         self._nodes_searched = 0
-        root = MCTSNode(board)
-        for _ in range(self.n_simulations):
+        rollout_plies, rollout_time = self.rollout.plies, self.rollout.elapsed
+        root = self._reuse_root(board) if self.reuse_tree else None
+        if root is None:
+            self._positions = {}
+            key = zobrist_hash(board)
+            root = DAGNode(key) if self.dag else MCTSNode(zobrist_hash=key)
+            if self.dag:
+                self._positions[key] = root
+            self.node_count = 1
+        else:
+            self.node_count = len(self._positions) if self.dag else len(_reachable(root))
+        self.reused_visits = root.visits
+        simulate = self._simulate_dag if self.dag else self._simulate
+        cap = self._simulation_cap(limits)
+        with stats.phase("simulations"):
+            while cap is None or stats.simulations < cap:
+                batch = self.INFO_EVERY if self.on_info is not None or cap is None else cap
+                if cap is not None:
+                    batch = min(batch, cap - stats.simulations)
+                done = simulate(root, board, batch, stats, limits)
+                stats.simulations += done
+                if self.on_info is not None:
+                    self._report(root, stats, rollout_plies)
+                    self.on_info(stats)
+                if done < batch:
+                    break  # parada o tiempo agotado
+        stats.nodes = self._nodes_searched
+        stats.rollout_plies = self.rollout.plies - rollout_plies
+        if stats.timers is not None:
+            stats.timers["rollout"] = self.rollout.elapsed - rollout_time
+
+        # Choose best move
+        self._root = root
+        self._root_ply = len(board.move_stack)
+        self._report(root, stats, rollout_plies)
+        return self.finish_stats(stats, stats.pv[0] if stats.pv else None)
+
+    def _simulation_cap(self, limits):
+        """Simulations to run: `n_simulations`, the node limit, or None (until time or a stop)."""
+        if limits is None:
+            return self.n_simulations
+        if limits.node_limit is not None:
+            return limits.node_limit
+        if limits.deadline is not None or limits.stop_event is not None:
+            return None
+        return self.n_simulations
+
+    def _report(self, root, stats: SearchStats, rollout_plies: int):
+        """Progress fields of `stats`: counters, most visited line and its value in centipawns."""
+        stats.nodes = self._nodes_searched
+        stats.rollout_plies = self.rollout.plies - rollout_plies
+        stats.elapsed = time.perf_counter() - stats.start
+        stats.pv = _principal_variation(root)
+        stats.depth = len(stats.pv)
+        children = [item for item in _root_stats(root) if item[1]]
+        if children:
+            _, visits, wins = max(children, key=lambda item: item[1])
+            p = min(max(wins / visits, 1e-3), 1 - 1e-3)
+            stats.score = round(RolloutEngine.ELO_SCALE * math.log10(p / (1 - p)))
+
+    def _simulate(self, root: MCTSNode, board: chess.Board, n_simulations: int, stats: SearchStats,
+                  limits: SearchLimits = None) -> int:
+        """
+        Run `n_simulations` selection / expansion / rollout / backpropagation steps
+        from `root`, fewer if `limits` stops the search; returns how many ran.
+        """
+        work = board.copy()  # único tablero: se avanza por el camino y se deshace al final
+
+        for done in range(n_simulations):
+            if limits is not None and limits.poll():
+                return done
+            if self.max_nodes is not None and self.node_count >= self.max_nodes:
+                with stats.phase("gc"):
+                    self._evict(root)
             self._nodes_searched += 1
             node = root
+            plies = 0
             # Selection
-            while node.children and node.is_fully_expanded():
+            while True:
+                if node.untried is None:
+                    node.generate_moves(work)
+                if node.untried or not node.children:
+                    break
                 node = node.best_child()
+                work.push(decode_move(node.move))
+                plies += 1
             # Expansion
-            if not node.board.is_game_over():
-                legal_moves = list(node.board.legal_moves)
-                tried_moves = [child.move for child in node.children]
-                for move in legal_moves:
-                    if move not in tried_moves:
-                        new_board = node.board.copy()
-                        new_board.push(move)
-                        new_hash = self.transposition_key(new_board)
-
-                        if new_hash in self.transposition_table:
-                            child_node = self.transposition_table[new_hash]
-                            child_node.parent = node  # enlazar al nuevo padre
-                            # ⚠️ Resetear stats al reutilizar
-                            child_node.visits = 0
-                            child_node.wins = 0
-                        else:
-                            child_node = MCTSNode(new_board, parent=node, move=move, zobrist_hash=new_hash)
-                            self._nodes_searched += 1
-                            self.transposition_table[new_hash] = child_node
-
-                        node.children.append(child_node)
-                        node = child_node
-                        break
-            # Simulation
-            # Simulation usando heurística
-            sim_board = node.board.copy()
-            max_depth = 30  # límite de jugadas a simular para no ir tan profundo
-            depth = 0
-
-            while not sim_board.is_game_over() and depth < max_depth:
-                moves = list(sim_board.legal_moves)
-                moves.sort(key=lambda m: sim_board.is_capture(m), reverse=True)
-                candidate_moves = moves[:min(self.top_n, len(moves))]
-                move = random.choice(candidate_moves)
-                sim_board.push(move)
-                depth += 1
-
-            if sim_board.is_game_over():
-                # Si terminó la partida, recompensa clásica
-                result = sim_board.result()
-                reward = self._get_reward(result, color)
+            if node.untried:
+                code = node.untried.pop()
+                move = decode_move(code)
+                child_node = MCTSNode(node, code, update_hash(node.hash, work, move))
+                self._nodes_searched += 1
+                self.node_count += 1
+                node.children.append(child_node)
+                node = child_node
+                work.push(move)
+                plies += 1
+            leaf_turn = work.turn
+            # Simulation: recompensa siempre desde el punto de vista de las blancas
+            if node.untried is not None and not node.untried and not node.children:
+                # Nodo terminal ya reconocido por generate_moves: resultado exacto
+                reward = self._get_reward(work.result(), chess.WHITE)
             else:
-                # Si llegamos al límite, usamos la heurística de Evaluator
-                score = Evaluator.evaluate_board(sim_board)
-                # Normalizamos score a [0,1] para que sea compatible con backprop
-                reward = 1 / (1 + pow(10, -score/800))
-  # tipo fórmula Elo/logística
-            # Backpropagation
+                reward = self.rollout.run(work)
+            for _ in range(plies):
+                work.pop()
+            # Backpropagation: cada nodo acumula el resultado del bando que movió hacia él,
+            # que es el que lo elige en best_child
+            turn = leaf_turn
             while node:
                 node.visits += 1
-                if node.board.turn == color:
+                if turn == chess.BLACK:
                     node.wins += reward
                 else:
                     node.wins += 1 - reward
+                turn = not turn
                 node = node.parent
+        return n_simulations
 
-        # Choose best move
-        if not root.children:
+    def _simulate_dag(self, root: DAGNode, board: chess.Board, n_simulations: int, stats: SearchStats,
+                      limits: SearchLimits = None) -> int:
+        """
+        Same loop as `_simulate` on a DAG: positions reached by different move
+        orders share one DAGNode (looked up by Zobrist key) instead of growing
+        duplicated subtrees. Backpropagation follows the path actually taken,
+        updating every edge on it and each position once. A position repeated
+        on the path ends the simulation as a draw.
+        """
+        positions = self._positions
+        work = board.copy()
+
+        for done in range(n_simulations):
+            if limits is not None and limits.poll():
+                return done
+            if self.max_nodes is not None and self.node_count >= self.max_nodes:
+                with stats.phase("gc"):
+                    self._evict(root)
+            self._nodes_searched += 1
+            node = root
+            path = []  # (nodo, índice de arista) recorridos
+            on_path = {root.hash}
+            reward = None
+            # Selection
+            while True:
+                if node.untried is None:
+                    node.generate_moves(work)
+                if node.untried or not node.children:
+                    break
+                i = node.best_edge()
+                path.append((node, i))
+                work.push(decode_move(node.moves[i]))
+                node = node.children[i]
+                if node.hash in on_path:
+                    reward = 0.5  # repetición dentro del camino: tablas
+                    break
+                on_path.add(node.hash)
+            # Expansion
+            if reward is None and node.untried:
+                code = node.untried.pop()
+                move = decode_move(code)
+                key = update_hash(node.hash, work, move)
+                child_node = positions.get(key)
+                if child_node is None:
+                    child_node = positions[key] = DAGNode(key)
+                    self._nodes_searched += 1
+                    self.node_count += 1
+                path.append((node, node.add_edge(code, child_node)))
+                node = child_node
+                work.push(move)
+                if key in on_path:
+                    reward = 0.5
+                on_path.add(key)
+            leaf_turn = work.turn
+            # Simulation: recompensa siempre desde el punto de vista de las blancas
+            if reward is not None:
+                pass
+            elif node.untried is not None and not node.untried and not node.children:
+                reward = self._get_reward(work.result(), chess.WHITE)
+            else:
+                reward = self.rollout.run(work)
+            for _ in range(len(path)):
+                work.pop()
+            # Backpropagation por el camino: aristas y posiciones (cada una una vez)
+            mover_reward = reward if leaf_turn == chess.BLACK else 1 - reward
+            node.visits += 1
+            node.wins += mover_reward
+            seen = {node.hash}
+            for parent, i in reversed(path):
+                parent.edge_visits[i] += 1
+                parent.edge_wins[i] += mover_reward
+                mover_reward = 1 - mover_reward
+                if parent.hash not in seen:
+                    seen.add(parent.hash)
+                    parent.visits += 1
+                    parent.wins += mover_reward
+        return n_simulations
+
+    # ------------------ MEMORY BUDGET ------------------ #
+    def _evict(self, root):
+        """
+        Free the least visited leaves until the tree is back to GC_KEEP of the
+        node budget. The move of each freed leaf goes back to its parent's
+        untried moves, so it can be expanded again later.
+        """
+        target = int(self.max_nodes * self.GC_KEEP)
+        nodes = list(_reachable(root).values())
+        while len(nodes) > target:
+            leaves = [node for node in nodes if not node.children and node is not root]
+            if not leaves:
+                break
+            leaves.sort(key=lambda node: node.visits)
+            victims = {id(node) for node in leaves[:len(nodes) - target]}
+            for node in nodes:
+                if node.children:
+                    self._drop_children(node, victims)
+            nodes = [node for node in nodes if id(node) not in victims]
+            self.evicted += len(victims)
+        if self.dag:
+            # Se modifica en sitio: _simulate_dag guarda una referencia al diccionario
+            self._positions.clear()
+            self._positions.update((node.hash, node) for node in nodes)
+        self.node_count = len(nodes)
+
+    def _drop_children(self, node, victims):
+        if not any(id(child) in victims for child in node.children):
+            return
+        if self.dag:
+            kept = [i for i, child in enumerate(node.children) if id(child) not in victims]
+            for i, child in enumerate(node.children):
+                if id(child) in victims and node.moves[i] not in node.untried:
+                    node.untried.append(node.moves[i])
+            node.children = [node.children[i] for i in kept]
+            node.moves = array('H', (node.moves[i] for i in kept))
+            node.edge_visits = array('I', (node.edge_visits[i] for i in kept))
+            node.edge_wins = array('d', (node.edge_wins[i] for i in kept))
+        else:
+            for child in node.children:
+                if id(child) in victims:
+                    node.untried.append(child.move)
+            node.children = [child for child in node.children if id(child) not in victims]
+
+    # ------------------ ROOT PARALLEL ------------------ #
+    def _select_move_parallel(self, board: chess.Board, stats: SearchStats, limits: SearchLimits = None):
+        """
+        Root parallelisation: every worker grows its own tree from `board` with
+        its own seed and a share of the simulations (or of the node limit);
+        root children visits and wins are summed per move and the most visited
+        move is played. The seeds come from the instance RNG, so a fixed `seed`
+        gives a fixed answer. Workers get the time left in `limits` and share a
+        stop Event, set here when `limits` is stopped or its stop event fires.
+        The workers' counters are added to `stats`.
+        """
+        if self._pool is None:
+            ctx = multiprocessing.get_context()
+            self._pool_stop = ctx.Event()  # se hereda vía initializer: no se puede enviar en cada tarea
+            self._pool = ctx.Pool(self.workers, initializer=_init_parallel_worker, initargs=(self._pool_stop,))
+        self._pool_stop.clear()
+        cap = self._simulation_cap(limits)
+        shares = [None] * self.workers
+        if cap is not None:
+            share, extra = divmod(cap, self.workers)
+            shares = [share + (1 if i < extra else 0) for i in range(self.workers)]
+        time_limit = None
+        if limits is not None and limits.deadline is not None:
+            time_limit = max(0.0, limits.deadline - time.perf_counter())
+        tasks = [
+            (board, shares[i], time_limit, self._rng.getrandbits(32), self.rollout_policy, self.dag,
+             self.max_nodes and max(2, self.max_nodes // self.workers), self.profile)
+            for i in range(self.workers)
+        ]
+        pending = self._pool.map_async(_root_parallel_worker, tasks)
+        while not pending.ready():
+            pending.wait(0.01)
+            if limits is not None and limits.poll():
+                self._pool_stop.set()  # los workers paran tras su simulación en curso
+        visits, wins = {}, {}
+        for children, worker_stats in pending.get():
+            stats.merge(worker_stats)
+            stats.depth = max(stats.depth, worker_stats.depth)
+            for code, child_visits, child_wins in children:
+                visits[code] = visits.get(code, 0) + child_visits
+                wins[code] = wins.get(code, 0) + child_wins
+        self._root = None  # los árboles quedan en los workers: no se reutilizan
+        self.reused_visits = 0
+        self._nodes_searched = stats.nodes
+        stats.workers = self.workers
+        if not visits:
+            return self.finish_stats(stats, None)
+        # A igualdad de visitas decide el valor acumulado y después el código (determinista)
+        best = max(visits, key=lambda code: (visits[code], wins[code], code))
+        return self.finish_stats(stats, decode_move(best))
+
+    def _reuse_root(self, board: chess.Board):
+        """
+        Find the node of the previous tree that matches `board` (after our move
+        and the opponent's reply) and promote it to root; the rest of the old
+        tree is released. Returns None when the position is not in the tree.
+        """
+        node, self._root = self._root, None
+        if node is None or len(board.move_stack) < self._root_ply:
             return None
-        best = max(root.children, key=lambda c: c.visits)
-
-        # I'm tired, just check and select the first best move possible
-        # This is return some good move but of past position, i have clear the cache somehow
-        if best.move not in board.legal_moves:
-            # fallback: elegir otro hijo válido
-            valid_children = [c for c in root.children if c.move in board.legal_moves]
-            if valid_children:
-                best = max(valid_children, key=lambda c: c.visits)
+        for move in board.move_stack[self._root_ply:]:
+            code = encode_move(move)
+            if self.dag:
+                node = node.children[node.moves.index(code)] if code in node.moves else None
             else:
-                return random.choice(list(board.legal_moves)) if board.legal_moves else None
-        return best.move, self._nodes_searched
+                node = next((child for child in node.children if child.move == code), None)
+            if node is None:
+                return None
+        if node.hash != zobrist_hash(board):
+            return None  # otra partida u otra posición de origen
+        if self.dag:
+            self._positions = {child.hash: child for child in _reachable(node).values()}
+        elif node.parent is not None:
+            node.parent.children.remove(node)
+            node.parent = None
+        return node
 
     def _get_reward(self, result, color):
         if result == '1-0':
@@ -127,42 +485,64 @@ class MonteCarloTreeSearchAI(ChessAI):
         else:
             return 0.5
 
-    def _init_zobrist(self):
-        random.seed(42)  # opcional: fija la semilla
-        self._zobrist_table = {}
-        pieces = ['P', 'N', 'B', 'R', 'Q', 'K', 'p', 'n', 'b', 'r', 'q', 'k']
-        for sq in range(64):
-            for piece in pieces:
-                self._zobrist_table[(piece, sq)] = random.getrandbits(64)
-        self._zobrist_table['turn'] = random.getrandbits(64)
-        for cr in ['K', 'Q', 'k', 'q']:
-            self._zobrist_table[cr] = random.getrandbits(64)
-        for sq in range(64):
-            self._zobrist_table[('ep', sq)] = random.getrandbits(64)
-
-    def transposition_key(self, board: chess.Board):
-        """Devuelve una clave única para el tablero actual usando Zobrist hashing personalizado."""
-        # Inicializar la tabla Zobrist si no existe
-        
-        h = 0
-        # Piezas en el tablero
-        for sq in range(64):
-            piece = board.piece_at(sq)
-            if piece:
-                h ^= self._zobrist_table[(piece.symbol(), sq)]
-        # Turno
-        if board.turn == chess.WHITE:
-            h ^= self._zobrist_table['turn']
-        # Enroques
-        if board.has_kingside_castling_rights(chess.WHITE):
-            h ^= self._zobrist_table['K']
-        if board.has_queenside_castling_rights(chess.WHITE):
-            h ^= self._zobrist_table['Q']
-        if board.has_kingside_castling_rights(chess.BLACK):
-            h ^= self._zobrist_table['k']
-        if board.has_queenside_castling_rights(chess.BLACK):
-            h ^= self._zobrist_table['q']
-        # Peón al paso
-        if board.ep_square is not None:
-            h ^= self._zobrist_table[('ep', board.ep_square)]
-        return h
\ No newline at end of file
+
+def _root_stats(root):
+    """(move code, visits, wins) of every root edge."""
+    if isinstance(root, DAGNode):
+        return list(zip(root.moves, root.edge_visits, root.edge_wins))
+    return [(child.move, child.visits, child.wins) for child in root.children]
+
+
+def _principal_variation(root, max_len: int = 64) -> list:
+    """Most visited line from `root` (ends at an unvisited node or, in a DAG, a repeated position)."""
+    pv, seen, node = [], {id(root)}, root
+    while len(pv) < max_len and node.children:
+        if isinstance(node, DAGNode):
+            i = max(range(len(node.children)), key=lambda i: node.edge_visits[i])
+            if not node.edge_visits[i]:
+                break
+            code, node = node.moves[i], node.children[i]
+        else:
+            node = max(node.children, key=lambda child: child.visits)
+            if not node.visits:
+                break
+            code = node.move
+        if id(node) in seen:
+            break
+        seen.add(id(node))
+        pv.append(decode_move(code))
+    return pv
+
+
+def _reachable(root) -> dict:
+    """id -> node for every node still reachable from `root`."""
+    nodes = {id(root): root}
+    stack = [root]
+    while stack:
+        for child in stack.pop().children:
+            if id(child) not in nodes:
+                nodes[id(child)] = child
+                stack.append(child)
+    return nodes
+
+
+_stop_event = None  # Event de parada del proceso worker (ver _init_parallel_worker)
+
+
+def _init_parallel_worker(stop_event):
+    global _stop_event
+    _stop_event = stop_event
+
+
+def _root_parallel_worker(task):
+    """
+    Pool entry point: one independent tree, returns its root children stats
+    and its SearchStats. `n_simulations` None means until the time limit or
+    the shared stop event.
+    """
+    board, n_simulations, time_limit, seed, rollout_policy, dag, max_nodes, profile = task
+    ai = MonteCarloTreeSearchAI(n_simulations=n_simulations or 1, reuse_tree=False, seed=seed,
+                                rollout_policy=rollout_policy, dag=dag, max_nodes=max_nodes)
+    ai.profile = profile
+    stats = ai.select_move(board, board.turn, SearchLimits(time_limit, n_simulations, stop_event=_stop_event))
+    return _root_stats(ai._root), stats
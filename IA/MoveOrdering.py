@@ -0,0 +1,100 @@
+import chess
+
+
+class MoveOrderer:
+    """
+    Move ordering shared by the alpha-beta searchers:
+    TT / previous best move, then captures by MVV-LVA, promotions,
+    killer moves of the current ply and finally quiet moves by history score.
+    """
+
+    MAX_PLY = 128
+    TT_SCORE = 1 << 30
+    CAPTURE_SCORE = 1 << 28
+    PROMOTION_SCORE = 1 << 27
+    KILLER_SCORE = 1 << 26  # el segundo killer recibe KILLER_SCORE - 1
+    HISTORY_MAX = (1 << 25)  # la historia nunca supera a un killer
+
+    # Índice por tipo de pieza (PAWN=1 ... KING=6)
+    VICTIM_VALUE = [0, 100, 320, 330, 500, 900, 0]
+
+    def __init__(self):
+        self.killers = [[None, None] for _ in range(self.MAX_PLY)]
+        self.history = [[0] * 4096, [0] * 4096]  # [color][from * 64 + to]
+
+    def age(self):
+        """Call between moves: old history fades and killers from the last search are dropped."""
+        for table in self.history:
+            for i, value in enumerate(table):
+                if value:
+                    table[i] = value >> 1
+        for slots in self.killers:
+            slots[0] = slots[1] = None
+
+    def order(self, board: chess.Board, ply: int = 0, tt_move: chess.Move = None) -> list:
+        history = self.history[board.turn]
+        killer_1, killer_2 = self.killers[ply] if ply < self.MAX_PLY else (None, None)
+        them = board.occupied_co[not board.turn]
+        ep_square = board.ep_square
+        scored = []
+        for move in board.legal_moves:
+            to_sq = move.to_square
+            if move == tt_move:
+                score = self.TT_SCORE
+            elif chess.BB_SQUARES[to_sq] & them:
+                # MVV-LVA: la víctima más valiosa primero, a igualdad el atacante más barato
+                score = (self.CAPTURE_SCORE + 16 * self.VICTIM_VALUE[board.piece_type_at(to_sq)]
+                         - board.piece_type_at(move.from_square))
+            elif to_sq == ep_square and board.piece_type_at(move.from_square) == chess.PAWN:
+                score = self.CAPTURE_SCORE + 16 * self.VICTIM_VALUE[chess.PAWN] - chess.PAWN
+            elif move.promotion:
+                score = self.PROMOTION_SCORE + move.promotion
+            elif move == killer_1:
+                score = self.KILLER_SCORE
+            elif move == killer_2:
+                score = self.KILLER_SCORE - 1
+            else:
+                score = history[(move.from_square << 6) | to_sq]
+            scored.append((score, move))
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [move for _, move in scored]
+
+    def order_noisy(self, board: chess.Board) -> list:
+        """Captures and queen promotions only (for quiescence), best MVV-LVA first."""
+        us = board.turn
+        scored = []
+        for move in board.generate_legal_captures():
+            if move.promotion and move.promotion != chess.QUEEN:
+                continue
+            victim = board.piece_type_at(move.to_square) or chess.PAWN  # al paso: peón
+            score = 16 * self.VICTIM_VALUE[victim] - board.piece_type_at(move.from_square)
+            if move.promotion:
+                score += 16 * self.VICTIM_VALUE[chess.QUEEN]
+            scored.append((score, move))
+        seventh = chess.BB_RANK_7 if us == chess.WHITE else chess.BB_RANK_2
+        promoting = board.pawns & board.occupied_co[us] & seventh
+        if promoting:
+            for move in board.generate_legal_moves(promoting, ~board.occupied & chess.BB_ALL):
+                if move.promotion == chess.QUEEN:
+                    scored.append((16 * self.VICTIM_VALUE[chess.QUEEN], move))
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [move for _, move in scored]
+
+    def is_quiet(self, board: chess.Board, move: chess.Move) -> bool:
+        return not move.promotion and not board.is_capture(move)
+
+    def record_cutoff(self, board: chess.Board, move: chess.Move, ply: int, depth: int):
+        """Register a beta cutoff (board in the position before `move`)."""
+        if not self.is_quiet(board, move):
+            return
+        if ply < self.MAX_PLY:
+            slots = self.killers[ply]
+            if slots[0] != move:
+                slots[1] = slots[0]
+                slots[0] = move
+        table = self.history[board.turn]
+        i = (move.from_square << 6) | move.to_square
+        table[i] += depth * depth
+        if table[i] > self.HISTORY_MAX:
+            for j, value in enumerate(table):
+                table[j] = value >> 1
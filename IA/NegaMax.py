@@ -1,6 +1,14 @@
-from IA_interfaze import ChessAI
+from IA_interfaze import ChessAI, SearchLimits, SearchStats
 import chess
-from IA.Heuristica import Evaluator
+import time
+import multiprocessing
+import queue
+from multiprocessing import shared_memory
+from IA.Heuristica import Evaluator, EvalState
+from IA.Zobrist import ZobristHasher, zobrist_hash
+from IA.MoveOrdering import MoveOrderer
+from IA.Bitbase import Bitbases
+from Data_structure.TranspositionTable import TranspositionTable
 
 
 class NegamaxChessAI(ChessAI):
@@ -8,29 +16,135 @@ class NegamaxChessAI(ChessAI):
     Chess AI using Negamax with Alpha-Beta pruning.
     """
 
-    def __init__(self, depth: int = 3):
+    MAX_DEPTH = 64
+    DELTA_MARGIN = 200  # margen de la poda delta en quiescencia (centipeones)
+
+    def __init__(self, depth: int = 3, time_limit: float = None, node_limit: int = None,
+                 tt_size_mb: float = 16, quiescence: bool = True, qnode_cap: int = 2000,
+                 check_hash: bool = False, workers: int = 1, use_bitbases: bool = True, tt_buffer=None):
         self.depth = depth
-        self.transposition_table = {}
+        self.workers = max(1, workers)
+        self.use_bitbases = use_bitbases
+        self.check_hash = check_hash
+        self.tt_size_mb = tt_size_mb
+        self.quiescence = quiescence
+        self.qnode_cap = qnode_cap
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self._limits = SearchLimits()
+        self.stats = SearchStats()  # registro de la búsqueda en curso
+        self.transposition_table = TranspositionTable(tt_size_mb, buffer=tt_buffer)  # buffer: TT ya reservada
         self._nodes_searched = 0
-        self._init_zobrist()
+        self._qnodes_searched = 0
+        self._qnode_budget = 0
+        self._zobrist = ZobristHasher(check=check_hash)
+        self._eval_state = EvalState()
+        self.move_orderer = MoveOrderer()
+        self.bitbases = Bitbases.load_default() if use_bitbases else None  # None si no se generaron
+        self._root_ply = 0
+        self._helper_id = 0
+        self._shm = None  # memoria compartida de la TT en modo paralelo
 
     # ------------------ PUBLIC METHOD ------------------ #
-    def select_move(self, board: chess.Board, color: chess.Color) -> chess.Move:
+    def select_move(self, board: chess.Board, color: chess.Color,
+                    time_limit: float = None, node_limit: int = None,
+                    limits: SearchLimits = None) -> SearchStats:
         """
         Select the best move for the given position using Negamax with Alpha-Beta pruning.
+        With a time (seconds) or node budget it runs iterative deepening and returns
+        the best move of the last completed depth; otherwise it searches `self.depth`.
+        `limits` replaces both budgets (e.g. to stop the search from another thread).
+        With `workers > 1` the search runs in parallel (Lazy SMP, see `_select_move_smp`).
         """
+        stats = self.new_stats()
+        move = self.book_move(board)
+        if move is not None:
+            stats.book = True
+            return self.finish_stats(stats, move)
+        if limits is None:
+            limits = SearchLimits(time_limit if time_limit is not None else self.time_limit,
+                                  node_limit if node_limit is not None else self.node_limit)
+        self.transposition_table.new_search()  # cada búsqueda desde la raíz envejece la TT
+        if self.workers > 1:
+            return self._select_move_smp(board, color, limits, stats)
+
+        self._prepare(board, limits, stats)
+        player_color = 1 if color == chess.WHITE else -1
+
+        if not self._limits.active:
+            with stats.phase("search"):
+                best_move, stats.score = self._search_root(board, self.depth, player_color)
+            stats.depth = self.depth
+        else:
+            best_move, stats.depth, stats.score = self._iterative_deepening(board, player_color)
+        self._collect(board, best_move)
+        return self.finish_stats(stats, best_move)
+
+    def close(self):
+        """Free the shared transposition table of the parallel mode."""
+        if self._shm is not None:
+            self.transposition_table.release()
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+            self.transposition_table = TranspositionTable(self.tt_size_mb)
+
+    def _prepare(self, board: chess.Board, limits: SearchLimits, stats: SearchStats):
         self._nodes_searched = 0
+        self._qnodes_searched = 0
+        self._limits = limits
+        self.stats = stats
+        self._zobrist.reset(board)
+        self._eval_state.reset(board)
+        self.move_orderer.age()
+        self._root_ply = len(board.move_stack)
+
+    def _iterative_deepening(self, board, player_color, max_depth=MAX_DEPTH, start_depth=1):
+        """Deepen until the budget runs out; returns (best move, last completed depth, its score)."""
+        # Convención: color = +1 si son blancas, -1 si son negras
+        best_move, best_depth, best_score = None, 0, 0
+        if self._limits.max_depth is not None:
+            max_depth = min(max_depth, self._limits.max_depth)
+        for depth in range(start_depth, max_depth + 1):
+            with self.stats.phase(f"depth {depth}"):
+                move, score = self._search_root(board, depth, player_color, best_move)
+            if self._limits.stopped:
+                break  # iteración incompleta: se descarta
+            best_move, best_depth, best_score = move, depth, score
+            if self.on_info is not None:
+                self.stats.depth, self.stats.score = depth, score
+                self._collect(board, move)
+                self.stats.elapsed = self._limits.elapsed()
+                self.on_info(self.stats)
+            if move is None or abs(score) >= Evaluator.MATE or not self._limits.can_start_iteration():
+                break
+
+        if best_move is None:
+            # Ni siquiera la profundidad 1 terminó: cualquier jugada legal es mejor que ninguna
+            best_move = next(iter(self._get_ordered_moves(board)), None)
+        return best_move, best_depth, best_score
+
+    def _search_root(self, board, depth, player_color, first_move=None):
         best_score = float('-inf')
         best_move = None
         alpha, beta = float('-inf'), float('inf')
+        if first_move is None:
+            entry = self.transposition_table.probe(self._zobrist.key)
+            first_move = entry[3] if entry is not None else None
 
-        # Convención: color = +1 si son blancas, -1 si son negras
-        player_color = 1 if color == chess.WHITE else -1
-
-        for move in self._get_ordered_moves(board):
-            board.push(move)
-            score = -self.negamax(board, self.depth - 1, -beta, -alpha, -player_color)
-            board.pop()
+        moves = self._get_ordered_moves(board, first_move)
+        if self.bitbases is not None and chess.popcount(board.occupied) <= Bitbases.MAX_PIECES:
+            moves = self.bitbases.filter_root_moves(board, moves)
+        if self._helper_id and len(moves) > 2:
+            # Los helpers de Lazy SMP recorren la raíz en otro orden (la primera jugada se mantiene)
+            shift = 1 + (self._helper_id - 1) % (len(moves) - 1)
+            moves = moves[:1] + moves[1 + shift:] + moves[1:1 + shift]
+        for move in moves:
+            self._make(board, move)
+            score = -self.negamax(board, depth - 1, -beta, -alpha, -player_color)
+            self._unmake(board)
+            if self._limits.stopped:
+                return best_move, best_score
 
             if score > best_score:
                 best_score = score
@@ -38,86 +152,250 @@ class NegamaxChessAI(ChessAI):
 
             alpha = max(alpha, best_score)  # update pruning window
 
-        return best_move, self._nodes_searched
+        if best_move is not None:
+            self.transposition_table.store(self._zobrist.key, depth, best_score, TranspositionTable.EXACT, best_move)
+        return best_move, best_score
+
+    # ------------------ LAZY SMP ------------------ #
+    def _select_move_smp(self, board, color, limits, stats):
+        """
+        Lazy SMP: `workers - 1` helper processes search the same root with their
+        own iterative deepening up to the same maximum depth (odd helpers skip
+        depth 1 and start at depth 2, root moves rotated) and share only the
+        transposition table, a lock-free block of shared memory. The main
+        process searches as worker 0; the answer is the move of the deepest
+        completed iteration, the main worker winning ties. The helpers'
+        counters are added to `stats`.
+        """
+        if self._shm is None:
+            n_bytes = TranspositionTable.entries_for(self.tt_size_mb) * TranspositionTable.ENTRY_BYTES
+            self._shm = shared_memory.SharedMemory(create=True, size=n_bytes)
+            age = self.transposition_table.age
+            self.transposition_table = TranspositionTable(buffer=self._shm.buf)
+            self.transposition_table.age = age
+
+        ctx = multiprocessing.get_context()
+        stop_event = ctx.Event()
+        results = ctx.Queue()
+        max_depth = min(self.MAX_DEPTH, limits.max_depth or self.MAX_DEPTH) if limits.active else self.depth
+        time_limit = limits.deadline - limits.start if limits.deadline is not None else None
+        settings = (self.tt_size_mb, self.quiescence, self.qnode_cap, self.profile, self.use_bitbases, self.check_hash)
+        helpers = [
+            ctx.Process(
+                target=_lazy_smp_helper,
+                args=(self._shm.name, self.transposition_table.age, settings, board.copy(), color,
+                      max_depth, time_limit, limits.node_limit, helper_id, stop_event, results),
+                daemon=True,
+            )
+            for helper_id in range(1, self.workers)
+        ]
+        for process in helpers:
+            process.start()
+
+        try:
+            self._prepare(board, limits, stats)
+            player_color = 1 if color == chess.WHITE else -1
+            best_move, stats.depth, stats.score = self._iterative_deepening(board, player_color, max_depth)
+            self._collect(board, best_move)
+        finally:
+            stop_event.set()
+
+        with stats.phase("helpers"):
+            for _ in helpers:
+                try:
+                    helper = results.get(timeout=10)
+                except queue.Empty:
+                    break
+                stats.merge(helper)
+                if helper.move is not None and helper.depth > stats.depth:
+                    best_move, stats.depth, stats.score, stats.pv = helper.move, helper.depth, helper.score, helper.pv
+            for process in helpers:
+                process.join(timeout=1)
+                if process.is_alive():
+                    process.terminate()
+        stats.workers = self.workers
+        return self.finish_stats(stats, best_move)
 
     def negamax(self, board, depth, alpha, beta, color):
         self._nodes_searched += 1
-        zobrist_key = self.transposition_key(board)
+        if self._limits.exceeded(self._nodes_searched + self._qnodes_searched):
+            return 0
+        zobrist_key = self._zobrist.key
 
         # Buscar en la Transposition Table
-        if zobrist_key in self.transposition_table:
-            entry_depth, entry_score = self.transposition_table[zobrist_key]
+        alpha_orig = alpha
+        stats = self.stats
+        stats.tt_probes += 1
+        entry = self.transposition_table.probe(zobrist_key)
+        tt_move = None
+        if entry is not None:
+            stats.tt_hits += 1
+            entry_depth, entry_score, entry_flag, tt_move = entry
             if entry_depth >= depth:
-                return entry_score
+                if entry_flag == TranspositionTable.EXACT:
+                    stats.tt_cutoffs += 1
+                    return entry_score
+                if entry_flag == TranspositionTable.LOWER:
+                    alpha = max(alpha, entry_score)
+                else:
+                    beta = min(beta, entry_score)
+                if alpha >= beta:
+                    stats.tt_cutoffs += 1
+                    return entry_score
 
         # Caso base
-        if depth == 0 or board.is_game_over():
+        if board.is_game_over() or (depth <= 0 and not self.quiescence):
             score = color * self._evaluate(board)
-            self.transposition_table[zobrist_key] = (depth, score)
+            self.transposition_table.store(zobrist_key, depth, score, TranspositionTable.EXACT)
+            return score
+        # Final con bitbase: las tablas se cortan en O(1); un final ganado se sigue
+        # buscando (el bitbase no da distancia al mate) y se puntúa así en el horizonte
+        if self.bitbases is not None and chess.popcount(board.occupied) <= Bitbases.MAX_PIECES:
+            score = self.bitbases.search_score(board)
+            if score is not None and (score == 0 or depth <= 0):
+                return score
+        if depth <= 0:
+            # Horizonte: resolver capturas pendientes antes de evaluar
+            self._qnode_budget = self._qnodes_searched + self.qnode_cap
+            score = self._quiesce(board, alpha, beta, color)
+            if self._limits.stopped:
+                return 0
+            if score <= alpha_orig:
+                flag = TranspositionTable.UPPER
+            elif score >= beta:
+                flag = TranspositionTable.LOWER
+            else:
+                flag = TranspositionTable.EXACT
+            self.transposition_table.store(zobrist_key, 0, score, flag)
             return score
 
         max_eval = -float("inf")
-        for move in board.legal_moves:
-            board.push(move)
+        best_move = None
+        for move in self._get_ordered_moves(board, tt_move):
+            self._make(board, move)
             score = -self.negamax(board, depth - 1, -beta, -alpha, -color)
-            board.pop()
+            self._unmake(board)
+            if self._limits.stopped:
+                return 0
 
-            max_eval = max(max_eval, score)
+            if score > max_eval:
+                max_eval = score
+                best_move = move
             alpha = max(alpha, score)
             if alpha >= beta:
+                self.move_orderer.record_cutoff(board, move, len(board.move_stack) - self._root_ply, depth)
                 break
 
-        self.transposition_table[zobrist_key] = (depth, max_eval)
+        # Un fallo alto solo acota por abajo y un fallo bajo solo por arriba
+        if max_eval <= alpha_orig:
+            flag = TranspositionTable.UPPER
+        elif max_eval >= beta:
+            flag = TranspositionTable.LOWER
+        else:
+            flag = TranspositionTable.EXACT
+        self.transposition_table.store(zobrist_key, depth, max_eval, flag, best_move)
         return max_eval
 
-    def _init_zobrist(self):
-        import random
-        random.seed(42)  # opcional: fija la semilla
-        self._zobrist_table = {}
-        pieces = ['P', 'N', 'B', 'R', 'Q', 'K', 'p', 'n', 'b', 'r', 'q', 'k']
-        for sq in range(64):
-            for piece in pieces:
-                self._zobrist_table[(piece, sq)] = random.getrandbits(64)
-        self._zobrist_table['turn'] = random.getrandbits(64)
-        for cr in ['K', 'Q', 'k', 'q']:
-            self._zobrist_table[cr] = random.getrandbits(64)
-        for sq in range(64):
-            self._zobrist_table[('ep', sq)] = random.getrandbits(64)
-
-    def transposition_key(self, board: chess.Board):
-        """Devuelve una clave única para el tablero actual usando Zobrist hashing personalizado."""
-        # Inicializar la tabla Zobrist si no existe
-        
-        h = 0
-        # Piezas en el tablero
-        for sq in range(64):
-            piece = board.piece_at(sq)
-            if piece:
-                h ^= self._zobrist_table[(piece.symbol(), sq)]
-        # Turno
-        if board.turn == chess.WHITE:
-            h ^= self._zobrist_table['turn']
-        # Enroques
-        if board.has_kingside_castling_rights(chess.WHITE):
-            h ^= self._zobrist_table['K']
-        if board.has_queenside_castling_rights(chess.WHITE):
-            h ^= self._zobrist_table['Q']
-        if board.has_kingside_castling_rights(chess.BLACK):
-            h ^= self._zobrist_table['k']
-        if board.has_queenside_castling_rights(chess.BLACK):
-            h ^= self._zobrist_table['q']
-        # Peón al paso
-        if board.ep_square is not None:
-            h ^= self._zobrist_table[('ep', board.ep_square)]
-        return h
+    def _quiesce(self, board, alpha, beta, color):
+        """Capture/promotion-only search with stand-pat, delta pruning and a node cap per leaf."""
+        self._qnodes_searched += 1
+        if self._limits.exceeded(self._nodes_searched + self._qnodes_searched):
+            return 0
+
+        stand_pat = color * self._evaluate(board)
+        if stand_pat >= beta or self._qnodes_searched >= self._qnode_budget:
+            return stand_pat
+        alpha = max(alpha, stand_pat)
+
+        for move in self.move_orderer.order_noisy(board):
+            # Poda delta: ni ganando la pieza capturada (más margen) se alcanza alpha
+            if not move.promotion:
+                victim = board.piece_type_at(move.to_square) or chess.PAWN
+                if stand_pat + Evaluator.VAL[victim] + self.DELTA_MARGIN <= alpha:
+                    continue
+            self._make(board, move)
+            score = -self._quiesce(board, -beta, -alpha, -color)
+            self._unmake(board)
+            if self._limits.stopped:
+                return 0
+            if score >= beta:
+                return score
+            alpha = max(alpha, score)
+        return alpha
 
     # ------------------ HELPERS ------------------ #
+    def _make(self, board: chess.Board, move: chess.Move):
+        """Push a move keeping the Zobrist key and evaluation state in sync."""
+        self._zobrist.make(board, move)
+        self._eval_state.make(board, move)
+        board.push(move)
+
+    def _unmake(self, board: chess.Board):
+        board.pop()
+        self._zobrist.unmake()
+        self._eval_state.unmake()
+
     def _evaluate(self, board: chess.Board) -> float:
         """Evaluate board always from White's perspective."""
-        return Evaluator.evaluate_board(board)
+        stats = self.stats
+        start = time.perf_counter()
+        score = Evaluator.evaluate_board(board, self._eval_state, self._zobrist.key)
+        stats.eval_time += time.perf_counter() - start
+        stats.eval_calls += 1
+        return score
+
+    def _collect(self, board: chess.Board, best_move: chess.Move):
+        """Fill the node counters and the principal variation of `self.stats` after a search."""
+        stats = self.stats
+        stats.nodes = self._nodes_searched
+        stats.qnodes = self._qnodes_searched
+        with stats.phase("pv"):
+            stats.pv = self._principal_variation(board, best_move, max(stats.depth, 1))
 
-    def _get_ordered_moves(self, board: chess.Board):
-        """Order moves to improve pruning (captures first)."""
-        moves = list(board.legal_moves)
-        moves.sort(key=lambda m: board.is_capture(m), reverse=True)
-        return moves
+    def _principal_variation(self, board: chess.Board, first_move: chess.Move, max_len: int) -> list:
+        """Best move followed by the TT moves of the positions it leads to (stops at a repetition)."""
+        if first_move is None:
+            return []
+        pv = [first_move]
+        board = board.copy()
+        board.push(first_move)
+        seen = {zobrist_hash(board)}
+        while len(pv) < max_len:
+            entry = self.transposition_table.probe(zobrist_hash(board))
+            move = entry[3] if entry is not None else None
+            if move is None or not board.is_legal(move):
+                break
+            board.push(move)
+            key = zobrist_hash(board)
+            if key in seen:
+                break
+            seen.add(key)
+            pv.append(move)
+        return pv
+
+    def _get_ordered_moves(self, board: chess.Board, first_move: chess.Move = None):
+        """Order moves to improve pruning (TT move, MVV-LVA captures, killers, history)."""
+        return self.move_orderer.order(board, len(board.move_stack) - self._root_ply, first_move)
+
+
+def _lazy_smp_helper(shm_name, tt_age, settings, board, color, max_depth, time_limit, node_limit,
+                     helper_id, stop_event, results):
+    """Entry point of a Lazy SMP helper process (module level so it can be pickled)."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    tt_size_mb, quiescence, qnode_cap, profile, use_bitbases, check_hash = settings
+    ai = NegamaxChessAI(tt_size_mb=tt_size_mb, quiescence=quiescence, qnode_cap=qnode_cap,
+                        check_hash=check_hash, use_bitbases=use_bitbases, tt_buffer=shm.buf)
+    ai.profile = profile
+    ai.transposition_table.age = tt_age
+    ai._helper_id = helper_id
+    try:
+        stats = ai.new_stats()
+        ai._prepare(board, SearchLimits(time_limit, node_limit, stop_event=stop_event), stats)
+        player_color = 1 if color == chess.WHITE else -1
+        move, stats.depth, stats.score = ai._iterative_deepening(
+            board, player_color, max_depth, start_depth=1 + helper_id % 2)
+        ai._collect(board, move)
+        results.put(ai.finish_stats(stats, move))
+    finally:
+        ai.transposition_table.release()
+        shm.close()
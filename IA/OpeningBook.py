@@ -0,0 +1,143 @@
+"""
+Opening book: a sorted binary file of (Zobrist key, move, weight) entries
+built from PGN files and read through mmap with binary search.
+
+    python -m IA.OpeningBook libro.bin partida.pgn [otra.pgn ...] [--max-ply 20]
+
+File layout: the 8-byte MAGIC followed by 12-byte little-endian `<QHH`
+entries (key from IA.Zobrist, move code as in TranspositionTable.encode_move,
+weight) sorted by key. Keys are the ones of this project, not Polyglot.
+"""
+import mmap
+import random
+import struct
+import sys
+import chess
+import chess.pgn
+
+from IA.Zobrist import zobrist_hash, update_hash
+from Data_structure.TranspositionTable import TranspositionTable
+
+MAGIC = b"CHBOOK01"
+ENTRY = struct.Struct("<QHH")
+KEY = struct.Struct("<Q")
+MAX_WEIGHT = 0xFFFF
+
+
+# ------------------ BUILDER ------------------ #
+def build_book(pgn_paths, out_path: str, max_ply: int = 20) -> int:
+    """
+    Stream the games of `pgn_paths` one by one and write the book to
+    `out_path`. Each (position, move) of the first `max_ply` plies weighs the
+    number of games that played it. Returns the number of entries written.
+    """
+    weights = {}
+    for path in pgn_paths:
+        with open(path, encoding="utf-8", errors="replace") as pgn:
+            while True:
+                game = chess.pgn.read_game(pgn)
+                if game is None:
+                    break
+                board = game.board()
+                key = zobrist_hash(board)
+                for ply, move in enumerate(game.mainline_moves()):
+                    if ply >= max_ply:
+                        break
+                    entry = (key, TranspositionTable.encode_move(move))
+                    weights[entry] = weights.get(entry, 0) + 1
+                    key = update_hash(key, board, move)
+                    board.push(move)
+
+    with open(out_path, "wb") as out:
+        out.write(MAGIC)
+        for (key, code), weight in sorted(weights.items()):
+            out.write(ENTRY.pack(key, code, min(weight, MAX_WEIGHT)))
+    return len(weights)
+
+
+# ------------------ READER ------------------ #
+class OpeningBook:
+    """
+    Read-only book mapped in memory: opening it costs no parsing, a lookup is
+    a binary search over the sorted keys.
+    """
+
+    def __init__(self, path: str, rng: random.Random = None):
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # fichero vacío
+            self._file.close()
+            raise ValueError(f"{path} is not an opening book")
+        if self._map[:len(MAGIC)] != MAGIC or (len(self._map) - len(MAGIC)) % ENTRY.size:
+            self.close()
+            raise ValueError(f"{path} is not an opening book")
+        self.size = (len(self._map) - len(MAGIC)) // ENTRY.size
+        self.rng = rng or random.Random()
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _key_at(self, i: int) -> int:
+        return KEY.unpack_from(self._map, len(MAGIC) + i * ENTRY.size)[0]
+
+    def entries(self, key: int) -> list:
+        """All (move code, weight) stored for `key`."""
+        lo, hi = 0, self.size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key_at(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        found = []
+        offset = len(MAGIC) + lo * ENTRY.size
+        while lo < self.size:
+            entry_key, code, weight = ENTRY.unpack_from(self._map, offset)
+            if entry_key != key:
+                break
+            found.append((code, weight))
+            lo += 1
+            offset += ENTRY.size
+        return found
+
+    def moves(self, board: chess.Board) -> list:
+        """Legal book moves of `board` as (move, weight), heaviest first."""
+        result = []
+        for code, weight in self.entries(zobrist_hash(board)):
+            move = TranspositionTable.decode_move(code)
+            if board.is_legal(move):
+                result.append((move, weight))
+        result.sort(key=lambda item: item[1], reverse=True)
+        return result
+
+    def choose(self, board: chess.Board, best: bool = False):
+        """A book move picked at random in proportion to its weight (the heaviest if `best`), or None."""
+        candidates = self.moves(board)
+        if not candidates:
+            return None
+        if best:
+            return candidates[0][0]
+        return self.rng.choices([move for move, _ in candidates],
+                                weights=[weight for _, weight in candidates])[0]
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    max_ply = 20
+    if "--max-ply" in args:
+        i = args.index("--max-ply")
+        max_ply = int(args[i + 1])
+        del args[i:i + 2]
+    if len(args) < 2:
+        print("uso: python -m IA.OpeningBook libro.bin partida.pgn [otra.pgn ...] [--max-ply 20]")
+        sys.exit(1)
+    n = build_book(args[1:], args[0], max_ply)
+    print(f"{args[0]}: {n} entradas")
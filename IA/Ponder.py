@@ -0,0 +1,116 @@
+"""
+Pondering: keep an AI searching in a background thread while the opponent
+(the human in main.py) thinks, and reuse that work for the reply.
+
+Two strategies, picked from the AI:
+    - MCTS with `reuse_tree`: grow the tree of the current position, at most
+      PONDER_SIMULATIONS times the AI's own simulations so a long think by the
+      human cannot grow the tree without bound; when the move arrives the
+      subtree under it becomes the next root.
+    - MinMax / Negamax: search the position after the expected reply (the
+      second move of the last principal variation). On a hit the search goes
+      on to its normal depth or budget and its result is played; on a miss it
+      is stopped and the normal search starts with a warm transposition table.
+
+The AI's `stats_sink` is detached while pondering, so speculative searches
+are not logged as moves; a pondered search that gets played is written
+with `ponder=True`.
+"""
+import inspect
+import threading
+import chess
+
+from IA_interfaze import SearchLimits
+
+
+class Ponderer:
+    PONDER_SIMULATIONS = 10  # tope de simulaciones de MCTS al pensar, en múltiplos de n_simulations
+
+    def __init__(self, ai):
+        self.ai = ai
+        self._sink = None
+        self.hits = 0
+        self.misses = 0
+        self._thread = None
+        self._limits = None
+        self._expected = None
+        self._result = None
+
+    @property
+    def active(self) -> bool:
+        return self._thread is not None
+
+    def _can_use_limits(self) -> bool:
+        return 'limits' in inspect.signature(self.ai.select_move).parameters
+
+    def start(self, board: chess.Board, expected: chess.Move = None):
+        """Start pondering on `board` (opponent to move); `expected` is the predicted reply."""
+        self.stop()
+        ai = self.ai
+        if board.is_game_over() or not self._can_use_limits() or getattr(ai, 'workers', 1) > 1:
+            return
+        self._limits = SearchLimits(stop_event=threading.Event())
+        if getattr(ai, 'reuse_tree', False):
+            self._expected = None
+            target = board.copy()
+            self._limits.node_limit = self.PONDER_SIMULATIONS * ai.n_simulations
+        elif expected is not None and board.is_legal(expected):
+            self._expected = expected
+            target = board.copy()
+            target.push(expected)
+            if target.is_game_over():
+                return
+            if getattr(ai, 'time_limit', None) is None and getattr(ai, 'node_limit', None) is None:
+                self._limits.max_depth = ai.depth  # lo mismo que haría la búsqueda normal
+        else:
+            return
+        self._result = None
+        self._sink, ai.stats_sink = ai.stats_sink, None  # se devuelve en _join (hilo principal)
+        self._thread = threading.Thread(target=self._run, args=(target,), daemon=True)
+        self._thread.start()
+
+    def _run(self, board: chess.Board):
+        self._result = self.ai.select_move(board, board.turn, limits=self._limits)
+
+    def stop(self):
+        """Abandon the background search (returns within milliseconds)."""
+        if self._thread is None:
+            return
+        self._limits.stop()
+        self._join()
+
+    def _join(self):
+        self._thread.join()
+        self._thread = None
+        self.ai.stats_sink = self._sink
+        self._sink = None
+
+    def finish(self, board: chess.Board):
+        """
+        Called with the position after the opponent's move. Returns the
+        pondered SearchStats when it can be played as is, otherwise None (the
+        caller runs its normal search, which reuses the tree / TT).
+        """
+        if self._thread is None:
+            return None
+        ai = self.ai
+        hit = (self._expected is not None and board.move_stack
+               and board.move_stack[-1] == self._expected)
+        if not hit:
+            self.stop()
+            if self._expected is not None:
+                self.misses += 1
+            return None
+
+        self.hits += 1
+        limits = self._limits
+        if getattr(ai, 'time_limit', None) is not None:
+            limits.set_time_limit(ai.time_limit)  # el tiempo del rival ya se aprovechó: se añade el propio
+            limits.release_stop_event()
+        elif getattr(ai, 'node_limit', None) is not None:
+            limits.node_limit = ai.node_limit
+            limits.release_stop_event()
+        self._join()  # con profundidad fija termina en su max_depth
+        if self.ai.stats_sink is not None and self._result is not None:
+            self.ai.stats_sink.write(self._result, ponder=True)
+        return self._result
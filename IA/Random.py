@@ -1,9 +1,10 @@
-from IA_interfaze import ChessAI
+from IA_interfaze import ChessAI, SearchStats
 import chess
 import random
 
 
 class RandomChessAI(ChessAI):
-    def select_move(self, board: chess.Board, color: chess.Color):
+    def select_move(self, board: chess.Board, color: chess.Color) -> SearchStats:
+        stats = self.new_stats()
         legal_moves = list(board.legal_moves)
-        return random.choice(legal_moves) if legal_moves else None
\ No newline at end of file
+        return self.finish_stats(stats, random.choice(legal_moves) if legal_moves else None)
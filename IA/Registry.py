@@ -0,0 +1,81 @@
+"""
+Build any AI of the project from a short text spec, so tools (torneo.py,
+benchmarks, UCI) can take engines from the command line:
+
+    "negamax:depth=4,tt_size_mb=32"   "mcts:n_simulations=300"   "random"
+"""
+import inspect
+
+from IA_interfaze import SearchLimits
+from IA.Random import RandomChessAI
+from IA.Heuristica import HeuristicChessAI
+from IA.Min_Max import MinMaxChessAI
+from IA.NegaMax import NegamaxChessAI
+from IA.MonteCarloTreeSearch import MonteCarloTreeSearchAI
+
+ENGINES = {
+    'random': RandomChessAI,
+    'heuristic': HeuristicChessAI,
+    'minmax': MinMaxChessAI,
+    'negamax': NegamaxChessAI,
+    'mcts': MonteCarloTreeSearchAI,
+}
+
+
+def _parse_value(text: str):
+    if text in ('True', 'False', 'None'):
+        return {'True': True, 'False': False, 'None': None}[text]
+    for cast in (int, float):
+        try:
+            return cast(text)
+        except ValueError:
+            pass
+    return text
+
+
+def parse_spec(spec: str):
+    """'negamax:depth=4' -> ('negamax', {'depth': 4})."""
+    name, _, args = spec.partition(':')
+    name = name.strip().lower()
+    if name not in ENGINES:
+        raise ValueError(f"unknown engine {name!r}, expected one of {sorted(ENGINES)}")
+    kwargs = {}
+    for item in filter(None, (part.strip() for part in args.split(','))):
+        key, sep, value = item.partition('=')
+        if not sep:
+            raise ValueError(f"bad engine option {item!r} in {spec!r} (expected key=value)")
+        kwargs[key.strip()] = _parse_value(value.strip())
+    return name, kwargs
+
+
+def build_ai(spec: str):
+    name, kwargs = parse_spec(spec)
+    return ENGINES[name](**kwargs)
+
+
+def accepts_limits(ai) -> set:
+    """Budget keywords (`time_limit`, `node_limit`) that `ai.select_move` takes."""
+    params = inspect.signature(ai.select_move).parameters
+    return {name for name in ('time_limit', 'node_limit') if name in params}
+
+
+def limit_kwargs(ai, limits: dict) -> dict:
+    """
+    `select_move` keywords for a per-move budget {'time_limit': s, 'node_limit': n}:
+    the plain keywords when the AI takes them, otherwise a fresh SearchLimits
+    for AIs that only take `limits` (MCTS). Call it right before each search.
+    """
+    budget = {key: value for key, value in limits.items() if value is not None}
+    if not budget:
+        return {}
+    accepted = accepts_limits(ai)
+    if accepted:
+        return {key: value for key, value in budget.items() if key in accepted}
+    if 'limits' in inspect.signature(ai.select_move).parameters:
+        return {'limits': SearchLimits(budget.get('time_limit'), budget.get('node_limit'))}
+    return {}
+
+
+def uses_processes(spec: str) -> bool:
+    """True when the spec starts its own worker processes (Lazy SMP, root-parallel MCTS)."""
+    return parse_spec(spec)[1].get('workers', 1) > 1
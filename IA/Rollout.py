@@ -0,0 +1,148 @@
+import chess
+import random
+import time
+from IA.Heuristica import Evaluator, EvalState
+
+
+class RolloutEngine:
+    """
+    Playouts for MCTS. Moves are sampled without building and sorting the full
+    legal move list: captures are generated on their own, other moves are
+    drawn at random from the pseudo-legal list and only the drawn move is
+    checked for legality. The end of the game is detected cheaply (no move
+    left, 50-move rule, insufficient material after a capture); repetitions
+    are ignored inside a playout.
+
+    Policies:
+        'uniform' - any legal move, uniformly.
+        'capture' - a capture with probability `capture_bias` when there is one.
+        'egreedy' - with probability `epsilon` a uniform move, otherwise the best
+                    material + piece-square score (incremental `EvalState`)
+                    among the captures and `sample` random moves.
+    """
+
+    POLICIES = ('uniform', 'capture', 'egreedy')
+    ELO_SCALE = 800  # escala de la logística que pasa centipeones a [0, 1]
+
+    def __init__(self, policy: str = 'capture', max_plies: int = 30, capture_bias: float = 0.9,
+                 epsilon: float = 0.2, sample: int = 6, rng: random.Random = None):
+        if policy not in self.POLICIES:
+            raise ValueError(f"unknown rollout policy {policy!r}, expected one of {self.POLICIES}")
+        self.policy = policy
+        self.max_plies = max_plies
+        self.capture_bias = capture_bias
+        self.epsilon = epsilon
+        self.sample = sample
+        self.rng = rng or random.Random()
+        self._state = EvalState() if policy == 'egreedy' else None
+        self.reset_stats()
+
+    # ------------------ METRICS ------------------ #
+    def reset_stats(self):
+        self.rollouts = 0
+        self.plies = 0
+        self.elapsed = 0.0
+
+    @property
+    def rollouts_per_second(self) -> float:
+        return self.rollouts / self.elapsed if self.elapsed else 0.0
+
+    # ------------------ PLAYOUT ------------------ #
+    def run(self, board: chess.Board) -> float:
+        """
+        Play out from `board` and return the result for White in [0, 1]
+        (win 1, draw 0.5, loss 0; the logistic of the evaluation when the
+        playout hits `max_plies`). The board is restored before returning.
+        """
+        start = time.perf_counter()
+        plies = 0
+        reward = None
+        state = self._state
+        if state is not None:
+            state.reset(board)
+        while plies < self.max_plies:
+            if board.halfmove_clock >= 100:
+                reward = 0.5
+                break
+            move = self.pick(board)
+            if move is None:
+                # Sin jugadas: mate para el bando que mueve o ahogado
+                reward = (0.0 if board.turn == chess.WHITE else 1.0) if board.is_check() else 0.5
+                break
+            capture = board.is_capture(move)
+            if state is not None:
+                state.make(board, move)
+            board.push(move)
+            plies += 1
+            if capture and board.is_insufficient_material():
+                reward = 0.5
+                break
+        if reward is None:
+            # Si llegamos al límite, usamos la heurística de Evaluator (tipo fórmula Elo/logística)
+            reward = 1 / (1 + pow(10, -Evaluator.evaluate_board(board) / self.ELO_SCALE))
+        for _ in range(plies):
+            board.pop()
+
+        self.rollouts += 1
+        self.plies += plies
+        self.elapsed += time.perf_counter() - start
+        return reward
+
+    def pick(self, board: chess.Board):
+        """Choose the next playout move with the configured policy (None if there is none)."""
+        rng = self.rng
+        if board.is_check():
+            # Las evasiones son pocas: se generan todas
+            evasions = list(board.generate_legal_moves())
+            return rng.choice(evasions) if evasions else None
+        if self.policy == 'uniform':
+            return self._sample_move(board)
+        if self.policy == 'capture':
+            if rng.random() < self.capture_bias:
+                captures = list(board.generate_legal_captures())
+                if captures:
+                    return rng.choice(captures)
+            return self._sample_move(board)
+        if rng.random() < self.epsilon:
+            return self._sample_move(board)
+        return self._greedy_move(board)
+
+    def _sample_move(self, board: chess.Board):
+        """Uniform legal move: draw pseudo-legal moves until one is legal."""
+        moves = list(board.generate_pseudo_legal_moves())
+        rng = self.rng
+        while moves:
+            i = rng.randrange(len(moves))
+            move = moves[i]
+            if not board.is_into_check(move):
+                return move
+            moves[i] = moves[-1]
+            moves.pop()
+        return None
+
+    def _greedy_move(self, board: chess.Board):
+        candidates = list(board.generate_legal_captures())
+        # `sample` jugadas legales distintas, sin reemplazo
+        moves = list(board.generate_pseudo_legal_moves())
+        rng = self.rng
+        drawn = 0
+        while moves and drawn < self.sample:
+            i = rng.randrange(len(moves))
+            move = moves[i]
+            moves[i] = moves[-1]
+            moves.pop()
+            if not board.is_into_check(move):
+                candidates.append(move)
+                drawn += 1
+        if not candidates:
+            return None
+        sign = 1 if board.turn == chess.WHITE else -1
+        state = self._state
+        best_move, best_score = None, None
+        for move in candidates:
+            state.make(board, move)
+            score = sign * state.material_pst()
+            state.unmake()
+            if best_score is None or score > best_score:
+                best_move, best_score = move, score
+        return best_move
@@ -0,0 +1,158 @@
+import chess
+import random
+
+
+# ------------------ TABLES ------------------ #
+# Claves aleatorias de 64 bits generadas con una semilla fija para que todos
+# los motores (y los procesos hijos) produzcan exactamente los mismos hashes.
+_rng = random.Random(42)
+
+# Índice de pieza: (color * 6 + piece_type - 1) * 64 + square
+PIECE_KEYS = [_rng.getrandbits(64) for _ in range(2 * 6 * 64)]
+TURN_KEY = _rng.getrandbits(64)
+# Un valor por cada combinación de derechos de enroque (K, Q, k, q -> 4 bits)
+_CASTLING_BASE = [_rng.getrandbits(64) for _ in range(4)]
+EP_KEYS = [_rng.getrandbits(64) for _ in range(8)]
+
+CASTLING_KEYS = []
+for _mask in range(16):
+    _h = 0
+    for _bit in range(4):
+        if _mask & (1 << _bit):
+            _h ^= _CASTLING_BASE[_bit]
+    CASTLING_KEYS.append(_h)
+
+# Esquina de la torre -> bit de derecho de enroque
+_CASTLING_BITS = (
+    (chess.BB_H1, 1),  # K
+    (chess.BB_A1, 2),  # Q
+    (chess.BB_H8, 4),  # k
+    (chess.BB_A8, 8),  # q
+)
+
+
+def _piece_key(color: chess.Color, piece_type: chess.PieceType, square: chess.Square) -> int:
+    return PIECE_KEYS[((0 if color else 6) + piece_type - 1) * 64 + square]
+
+
+def _castling_index(rights: chess.Bitboard) -> int:
+    if not rights:
+        return 0
+    index = 0
+    for bb, bit in _CASTLING_BITS:
+        if rights & bb:
+            index |= bit
+    return index
+
+
+# ------------------ FULL HASH ------------------ #
+def zobrist_hash(board: chess.Board) -> int:
+    """
+    Compute the Zobrist key of the position from scratch.
+    Used to seed the incremental hasher and to verify it.
+    """
+    h = 0
+    for color in chess.COLORS:
+        base = (0 if color else 6) * 64
+        for piece_type in chess.PIECE_TYPES:
+            offset = base + (piece_type - 1) * 64
+            for sq in chess.scan_forward(board.pieces_mask(piece_type, color)):
+                h ^= PIECE_KEYS[offset + sq]
+    if board.turn == chess.WHITE:
+        h ^= TURN_KEY
+    h ^= CASTLING_KEYS[_castling_index(board.clean_castling_rights())]
+    if board.ep_square is not None:
+        h ^= EP_KEYS[chess.square_file(board.ep_square)]
+    return h
+
+
+# ------------------ INCREMENTAL UPDATE ------------------ #
+def update_hash(key: int, board: chess.Board, move: chess.Move) -> int:
+    """
+    Return the key of the position reached after `move`.
+    `board` must still be in the position *before* the move is pushed.
+    """
+    key ^= TURN_KEY
+    if board.ep_square is not None:
+        key ^= EP_KEYS[chess.square_file(board.ep_square)]
+
+    if not move:
+        # Movimiento nulo: solo cambia el turno y se pierde el peón al paso
+        return key
+
+    from_sq, to_sq = move.from_square, move.to_square
+    color = board.turn
+    piece_type = board.piece_type_at(from_sq)
+
+    if piece_type == chess.KING and board.is_castling(move):
+        rank = chess.square_rank(from_sq)
+        kingside = board.is_kingside_castling(move)
+        rook_from = chess.square(7 if kingside else 0, rank)
+        rook_to = chess.square(5 if kingside else 3, rank)
+        king_to = chess.square(6 if kingside else 2, rank)
+        key ^= _piece_key(color, chess.KING, from_sq) ^ _piece_key(color, chess.KING, king_to)
+        key ^= _piece_key(color, chess.ROOK, rook_from) ^ _piece_key(color, chess.ROOK, rook_to)
+    else:
+        # Captura (normal o al paso)
+        captured_type = board.piece_type_at(to_sq)
+        if captured_type:
+            key ^= _piece_key(not color, captured_type, to_sq)
+        elif piece_type == chess.PAWN and to_sq == board.ep_square:
+            captured_sq = to_sq - 8 if color == chess.WHITE else to_sq + 8
+            key ^= _piece_key(not color, chess.PAWN, captured_sq)
+
+        key ^= _piece_key(color, piece_type, from_sq)
+        key ^= _piece_key(color, move.promotion or piece_type, to_sq)
+
+    # Derechos de enroque: se replica la regla de board.push (solo si aún quedan)
+    if board.castling_rights:
+        old_rights = board.clean_castling_rights()
+        new_rights = old_rights & ~chess.BB_SQUARES[from_sq] & ~chess.BB_SQUARES[to_sq]
+        if piece_type == chess.KING:
+            new_rights &= ~(chess.BB_RANK_1 if color == chess.WHITE else chess.BB_RANK_8)
+        key ^= CASTLING_KEYS[_castling_index(old_rights)] ^ CASTLING_KEYS[_castling_index(new_rights)]
+
+    # Nueva casilla al paso tras un avance doble
+    if piece_type == chess.PAWN and abs(to_sq - from_sq) == 16:
+        key ^= EP_KEYS[chess.square_file(from_sq)]
+    return key
+
+
+class ZobristHasher:
+    """
+    Keeps the Zobrist key of a board up to date across make/unmake.
+
+    Call `make(board, move)` right before `board.push(move)` and `unmake()`
+    right after `board.pop()`. With `check=True` every update is compared
+    against a full recompute and a mismatch raises AssertionError.
+    """
+
+    def __init__(self, board: chess.Board = None, check: bool = False):
+        self.check = check
+        self._stack = []
+        self.key = 0
+        if board is not None:
+            self.reset(board)
+
+    def reset(self, board: chess.Board) -> int:
+        self._stack = []
+        self.key = zobrist_hash(board)
+        return self.key
+
+    def make(self, board: chess.Board, move: chess.Move) -> int:
+        self._stack.append(self.key)
+        self.key = update_hash(self.key, board, move)
+        if self.check:
+            board.push(move)
+            expected = zobrist_hash(board)
+            board.pop()
+            if expected != self.key:
+                raise AssertionError(
+                    f"Zobrist mismatch after {move.uci()} in {board.fen()}: "
+                    f"{self.key:#018x} != {expected:#018x}"
+                )
+        return self.key
+
+    def unmake(self) -> int:
+        self.key = self._stack.pop()
+        return self.key
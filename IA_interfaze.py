@@ -1,5 +1,240 @@
+import json
+import time
 import chess
+from contextlib import nullcontext
+from dataclasses import dataclass, field, fields
+
 
 class ChessAI:
-    def select_move(self, board: chess.Board, color: chess.Color):
+    book = None  # OpeningBook opcional: se consulta antes de buscar
+    stats_sink = None  # StatsSink opcional: recibe el SearchStats de cada jugada
+    profile = False  # True: SearchStats.timers con el tiempo de cada fase
+    on_info = None  # callable(SearchStats) opcional: progreso durante la búsqueda (UCI "info")
+
+    def select_move(self, board: chess.Board, color: chess.Color) -> 'SearchStats':
         raise NotImplementedError
+
+    def new_stats(self) -> 'SearchStats':
+        """Empty record for the search that starts now (timers only when `profile` is on)."""
+        stats = SearchStats(engine=type(self).__name__, timers={} if self.profile else None)
+        stats._cache_mark = _cache_counters()
+        return stats
+
+    def finish_stats(self, stats: 'SearchStats', move: chess.Move) -> 'SearchStats':
+        """Close the record of a search: best move, elapsed time and a line to the sink."""
+        stats.move = move
+        stats.elapsed = time.perf_counter() - stats.start
+        # += : los helpers (Lazy SMP, MCTS en paralelo) ya sumaron los suyos con merge()
+        counters = zip(_cache_counters(), getattr(stats, '_cache_mark', (0, 0, 0, 0)))
+        for name, (now, mark) in zip(SearchStats.CACHE_COUNTERS, counters):
+            setattr(stats, name, getattr(stats, name) + now - mark)
+        if not stats.pv and move is not None:
+            stats.pv = [move]
+        if self.stats_sink is not None:
+            self.stats_sink.write(stats)
+        return stats
+
+    def book_move(self, board: chess.Board):
+        """Move from the opening book for `board`, or None when there is no book or no entry."""
+        if self.book is None:
+            return None
+        return self.book.choose(board)
+
+
+class _PhaseTimer:
+    __slots__ = ('timers', 'name', 'start')
+
+    def __init__(self, timers: dict, name: str):
+        self.timers = timers
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.timers[self.name] = self.timers.get(self.name, 0.0) + time.perf_counter() - self.start
+
+
+_NO_TIMER = nullcontext()
+
+
+def _cache_counters() -> tuple:
+    """Hit / probe counters of the Evaluator caches of this process (shared by all AIs)."""
+    from IA.Heuristica import Evaluator  # aquí: IA.Heuristica importa este módulo
+    return Evaluator.cache_counters()
+
+
+@dataclass
+class SearchStats:
+    """
+    What one `select_move` call did; every AI returns one. Counters an engine
+    does not have stay at zero (no TT in MinMax, no rollouts outside MCTS).
+    `score` is in centipawns from the side to move, `pv` a list of moves.
+    """
+    move: chess.Move = None
+    engine: str = ''
+    book: bool = False
+    score: float = None
+    depth: int = 0
+    pv: list = field(default_factory=list)
+    nodes: int = 0
+    qnodes: int = 0
+    elapsed: float = 0.0  # segundos
+    tt_probes: int = 0
+    tt_hits: int = 0
+    tt_cutoffs: int = 0
+    eval_calls: int = 0
+    eval_time: float = 0.0
+    simulations: int = 0
+    rollout_plies: int = 0
+    workers: int = 1
+    eval_cache_hits: int = 0
+    eval_cache_probes: int = 0
+    pawn_cache_hits: int = 0
+    pawn_cache_probes: int = 0
+    timers: dict = None  # fase -> segundos (solo con ChessAI.profile)
+    start: float = field(default_factory=time.perf_counter, repr=False)
+
+    # Aciertos / consultas de las cachés de Evaluator durante la búsqueda. Son
+    # contadores del proceso: si otra IA evalúa a la vez (ponder), cuenta aquí.
+    CACHE_COUNTERS = ('eval_cache_hits', 'eval_cache_probes', 'pawn_cache_hits', 'pawn_cache_probes')
+    # Contadores que se suman al juntar el trabajo de varios procesos
+    ADDITIVE = ('nodes', 'qnodes', 'tt_probes', 'tt_hits', 'tt_cutoffs', 'eval_calls', 'eval_time',
+                'simulations', 'rollout_plies') + CACHE_COUNTERS
+
+    @property
+    def nps(self) -> float:
+        return (self.nodes + self.qnodes) / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def eval_cache_rate(self) -> float:
+        return self.eval_cache_hits / self.eval_cache_probes if self.eval_cache_probes else 0.0
+
+    @property
+    def pawn_cache_rate(self) -> float:
+        return self.pawn_cache_hits / self.pawn_cache_probes if self.pawn_cache_probes else 0.0
+
+    def phase(self, name: str):
+        """Context manager adding the time of a phase to `timers`; does nothing when timers are off."""
+        if self.timers is None:
+            return _NO_TIMER
+        return _PhaseTimer(self.timers, name)
+
+    def merge(self, other: 'SearchStats'):
+        """Add the counters of a helper search (Lazy SMP, root-parallel MCTS) to this one."""
+        for name in self.ADDITIVE:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        if self.timers is not None and other.timers:
+            for name, seconds in other.timers.items():
+                self.timers[name] = self.timers.get(name, 0.0) + seconds
+
+    def to_dict(self) -> dict:
+        data = {f.name: getattr(self, f.name) for f in fields(self) if f.name != 'start'}
+        data['move'] = self.move.uci() if self.move else None
+        data['pv'] = [move.uci() for move in self.pv]
+        data['nps'] = round(self.nps)
+        return data
+
+
+class StatsSink:
+    """
+    JSON-lines sink: one object per search (the SearchStats fields plus the
+    `extra` given here, e.g. a game id), flushed line by line so a dashboard
+    can tail the file.
+    """
+
+    def __init__(self, path: str, **extra):
+        self._file = open(path, "a", encoding="utf-8")
+        self.extra = extra
+
+    def write(self, stats: SearchStats, **extra):
+        record = {**self.extra, **extra, **stats.to_dict()}
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SearchLimits:
+    """
+    Time / node budget of one search. Searchers call `exceeded(nodes)` at every
+    node; once the budget runs out (or `stop()` is called) it stays stopped.
+    `stop_event` (threading/multiprocessing Event) lets another thread or
+    process stop the search; a search given one runs until it is set unless
+    another bound applies, or until `release_stop_event()` hands it over to
+    the other bounds (ponderhit). `max_depth` caps iterative deepening.
+    """
+
+    CHECK_EVERY = 256  # llamadas entre consultas al reloj
+
+    def __init__(self, time_limit: float = None, node_limit: int = None, stop_event=None,
+                 max_depth: int = None):
+        self.start = time.perf_counter()
+        self.deadline = self.start + time_limit if time_limit is not None else None
+        self._clock_start = self.start  # inicio del presupuesto de tiempo
+        self.node_limit = node_limit
+        self.stop_event = stop_event
+        self._follow_event = True  # False tras release_stop_event(); el evento nunca pasa a None
+        self.max_depth = max_depth
+        self.stopped = False
+        self._calls = 0
+
+    @property
+    def active(self) -> bool:
+        """True when the search is bounded by these limits instead of the engine's fixed depth."""
+        return (self.deadline is not None or self.node_limit is not None
+                or self.stop_event is not None or self.max_depth is not None)
+
+    def set_time_limit(self, time_limit: float):
+        """(Re)start the clock budget from now, e.g. when a ponder search becomes the real one."""
+        self._clock_start = time.perf_counter()
+        self.deadline = self._clock_start + time_limit
+
+    def release_stop_event(self):
+        """
+        Stop waiting for `stop_event`: from now on only the clock, node and
+        depth bounds end the search. Safe while another thread is polling.
+        """
+        self._follow_event = False
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+    def stop(self):
+        self.stopped = True
+
+    def exceeded(self, nodes: int) -> bool:
+        if self.stopped:
+            return True
+        if self.node_limit is not None and nodes >= self.node_limit:
+            self.stopped = True
+        else:
+            self._calls += 1
+            if self._calls % self.CHECK_EVERY == 0:
+                self.poll()
+        return self.stopped
+
+    def poll(self) -> bool:
+        """Check the clock and the stop event now (for searches made of few, costly steps such as MCTS)."""
+        if not self.stopped:
+            deadline, event = self.deadline, self.stop_event  # se leen una vez: otro hilo puede cambiarlos
+            if deadline is not None and time.perf_counter() >= deadline:
+                self.stopped = True
+            elif event is not None and self._follow_event and event.is_set():
+                self.stopped = True
+        return self.stopped
+
+    def can_start_iteration(self) -> bool:
+        """An iteration usually costs more than all previous ones together: skip it past half the budget."""
+        if self.stopped:
+            return False
+        if self.deadline is not None and time.perf_counter() >= (self._clock_start + self.deadline) / 2:
+            return False
+        return True
@@ -0,0 +1,223 @@
+"""
+Bulk PGN analysis: streams a PGN file game by game, evaluates every position
+with one of the AIs across a process pool and writes an annotated PGN
+(`[%eval]` comments, `?`/`??` on mistakes and blunders with the engine's
+move) in the input order, game by game as they finish.
+
+    python analizar_pgn.py partidas.pgn analizadas.pgn --engine negamax:depth=3 --workers 4
+    python analizar_pgn.py partidas.pgn analizadas.pgn --engine negamax --time 0.1 --blunder 150
+
+Only a bounded window of games is in memory at any time, so files of any
+size can be processed.
+"""
+import argparse
+import collections
+import io
+import multiprocessing
+import sys
+import time
+import chess
+import chess.engine
+import chess.pgn
+
+from IA.Heuristica import Evaluator
+from IA.Registry import build_ai, limit_kwargs, uses_processes
+
+CLAMP = 1000  # centipeones: por encima de esto la partida ya está decidida
+MATE_SCORE = 10000
+
+_ai = None  # IA del proceso worker (se crea una vez por proceso)
+_spec = None
+
+
+def iter_pgn_texts(f):
+    """
+    Raw text of each game of a PGN stream: a new game starts at a tag line
+    ("[...") that follows movetext. Games are not parsed here, so the main
+    process only splits the file and the workers do the parsing.
+    """
+    lines, in_moves = [], False
+    for line in f:
+        if line.startswith('[') and in_moves:
+            yield ''.join(lines)
+            lines, in_moves = [], False
+        if line.strip() and not line.startswith('['):
+            in_moves = True
+        lines.append(line)
+    if any(line.strip() for line in lines):
+        yield ''.join(lines)
+
+
+def _init_worker(spec: str):
+    global _ai, _spec
+    _ai, _spec = build_ai(spec), spec
+
+
+def _mate_plies(board: chess.Board, pv: list):
+    """Plies until the checkmate that ends `pv`, or None when the line does not end in mate."""
+    board = board.copy(stack=False)
+    for plies, move in enumerate(pv, 1):
+        if not board.is_legal(move):
+            return None
+        board.push(move)
+        if board.is_checkmate():
+            return plies
+    return None
+
+
+def _evaluate(board: chess.Board, limits: dict):
+    """
+    (White-POV centipawns, PovScore for the [%eval] comment, engine move) of
+    `board`. Checkmates, on the board or found by the search (a score of
+    Evaluator.MATE), are Mate scores in the comment and ±MATE_SCORE for the
+    loss arithmetic.
+    """
+    if board.is_checkmate():
+        cp = -MATE_SCORE if board.turn == chess.WHITE else MATE_SCORE
+        return cp, chess.engine.PovScore(chess.engine.Mate(0), board.turn), None
+    if board.is_game_over(claim_draw=True):
+        return 0, chess.engine.PovScore(chess.engine.Cp(0), chess.WHITE), None
+    stats = _ai.select_move(board, board.turn, **limit_kwargs(_ai, limits))
+    score = stats.score or 0
+    if abs(score) >= Evaluator.MATE:
+        # Los motores no guardan la distancia: se cuenta en la PV o, si no llega al mate, la profundidad
+        plies = _mate_plies(board, stats.pv) or max(stats.depth, 1)
+        mate = (plies + 1) // 2 if score > 0 else -max(plies // 2, 1)
+        pov = chess.engine.PovScore(chess.engine.Mate(mate), board.turn)
+        score = MATE_SCORE if score > 0 else -MATE_SCORE
+    else:
+        pov = None
+    cp = score if board.turn == chess.WHITE else -score
+    if pov is None:
+        pov = chess.engine.PovScore(chess.engine.Cp(int(cp)), chess.WHITE)
+    return cp, pov, stats.move
+
+
+def _set_eval(node: chess.pgn.ChildNode, score: chess.engine.PovScore):
+    """node.set_eval(score), writing mate-in-0 too (python-chess skips it): #+0 / #-0 from White's side."""
+    white = score.white()
+    if white.is_mate() and white.mate() == 0:
+        node.set_eval(None)
+        sign = "+" if white > chess.engine.Cp(0) else "-"
+        node.comment = f"{node.comment} [%eval #{sign}0]".strip()
+    else:
+        node.set_eval(score)
+
+
+def analyse_game(task):
+    """Pool entry point: annotated PGN text and counters of one game."""
+    text, limits, blunder = task
+    game = chess.pgn.read_game(io.StringIO(text))
+    if game is None:
+        return "", 0, 0, 0
+    if hasattr(_ai, 'reset'):
+        _ai.reset()  # árbol de MCTS de la partida anterior
+    board = game.board()
+    nodes = list(game.mainline())
+    evals = [_evaluate(board, limits)]
+    for node in nodes:
+        board.push(node.move)
+        evals.append(_evaluate(board, limits))
+
+    mistakes = blunders = 0
+    board = game.board()
+    for i, node in enumerate(nodes):
+        before, _, best = evals[i]
+        after, score, _ = evals[i + 1]
+        _set_eval(node, score)
+        # Pérdida del bando que movió, con las evaluaciones acotadas a ±CLAMP
+        loss = max(-CLAMP, min(CLAMP, before)) - max(-CLAMP, min(CLAMP, after))
+        if board.turn == chess.BLACK:
+            loss = -loss
+        if loss >= blunder / 2:
+            if loss >= blunder:
+                node.nags.add(chess.pgn.NAG_BLUNDER)
+                blunders += 1
+            else:
+                node.nags.add(chess.pgn.NAG_MISTAKE)
+                mistakes += 1
+            if best is not None and best != node.move:
+                suggestion = f"Mejor {board.san(best)}"
+                node.comment = f"{node.comment} {suggestion}".strip()
+        board.push(node.move)
+
+    game.headers["Annotator"] = _spec
+    return str(game), len(nodes) + 1, mistakes, blunders
+
+
+def analyse_stream(games, out, spec: str, limits: dict, blunder: int, workers: int, window: int = None,
+                   progress=None):
+    """
+    Analyse the game texts of `games` with `workers` processes and write each
+    annotated game to `out` in input order as soon as it and all the previous
+    ones are done. At most `window` games are pending at once.
+    Returns (games, positions, mistakes, blunders).
+    """
+    window = window or 4 * workers
+    totals = [0, 0, 0, 0]
+
+    def emit(result):
+        text, positions, mistakes, blunders = result
+        if text:
+            print(text, file=out, end="\n\n")
+            out.flush()
+        for i, value in enumerate((1 if text else 0, positions, mistakes, blunders)):
+            totals[i] += value
+        if progress is not None:
+            progress(totals)
+
+    if workers <= 1:
+        _init_worker(spec)
+        for text in games:
+            emit(analyse_game((text, limits, blunder)))
+        return tuple(totals)
+
+    pending = collections.deque()
+    with multiprocessing.get_context().Pool(workers, initializer=_init_worker, initargs=(spec,)) as pool:
+        for text in games:
+            pending.append(pool.apply_async(analyse_game, ((text, limits, blunder),)))
+            while len(pending) >= window or (pending and pending[0].ready()):
+                emit(pending.popleft().get())
+        while pending:
+            emit(pending.popleft().get())
+    return tuple(totals)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Análisis de PGN por lotes.")
+    parser.add_argument("entrada", help="PGN de entrada ('-' para la entrada estándar)")
+    parser.add_argument("salida", help="PGN anotado de salida")
+    parser.add_argument("--engine", default="negamax:depth=3", help="spec de IA/Registry.py")
+    parser.add_argument("--time", type=float, default=None, help="segundos por posición")
+    parser.add_argument("--nodes", type=int, default=None, help="nodos por posición (simulaciones en MCTS)")
+    parser.add_argument("--blunder", type=int, default=200, help="caída en centipeones para '??' (la mitad: '?')")
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    args = parser.parse_args()
+
+    build_ai(args.engine)  # validar el spec antes de arrancar el pool
+    if args.workers > 1 and uses_processes(args.engine):
+        # los procesos del pool son daemon y no pueden crear procesos hijos
+        parser.error(f"{args.engine}: un motor con workers>1 necesita --workers 1")
+    limits = {'time_limit': args.time, 'node_limit': args.nodes}
+    start = time.perf_counter()
+
+    def progress(totals):
+        elapsed = time.perf_counter() - start
+        print(f"\r{totals[0]} partidas, {totals[1]} posiciones "
+              f"({totals[0] / elapsed:.2f} partidas/s, {totals[1] / elapsed:.0f} posiciones/s)",
+              end="", file=sys.stderr, flush=True)
+
+    source = sys.stdin if args.entrada == "-" else open(args.entrada, encoding="utf-8", errors="replace")
+    try:
+        with open(args.salida, "w", encoding="utf-8") as out:
+            games, positions, mistakes, blunders = analyse_stream(
+                iter_pgn_texts(source), out, args.engine, limits, args.blunder, args.workers, progress=progress)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    print(f"\n{games} partidas, {positions} posiciones, {mistakes} errores (?), {blunders} errores graves (??) "
+          f"en {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -8,6 +8,8 @@ from IA.Heuristica import HeuristicChessAI
 from IA.Min_Max import MinMaxChessAI
 from IA.NegaMax import NegamaxChessAI
 from IA.MonteCarloTreeSearch import MonteCarloTreeSearchAI
+from IA.Ponder import Ponderer
+from IA_interfaze import StatsSink
 import matplotlib.pyplot as plt
 
 # Unicode chess pieces mapping for python-chess
@@ -53,6 +55,22 @@ def exportar_pgn(board: chess.Board, filename: str = "partida.pgn"):
     with open(filename, "w", encoding="utf-8") as f:
         print(game, file=f, end="\n")
 
+def describir(stats) -> str:
+    """One line with the figures of a search (nodes, depth, speed, PV)."""
+    if stats.book:
+        return "Jugada de libro"
+    text = f"Nodos evaluados: {stats.nodes}"
+    if stats.qnodes:
+        text += f" (+{stats.qnodes} de quiescencia)"
+    if stats.simulations:
+        text += f", simulaciones: {stats.simulations}"
+    text += f", profundidad: {stats.depth}, {stats.nps:.0f} nodos/s, {stats.elapsed:.2f}s"
+    if stats.eval_cache_probes:
+        text += f", caché eval/peones: {stats.eval_cache_rate:.0%}/{stats.pawn_cache_rate:.0%}"
+    if len(stats.pv) > 1:
+        text += f", PV: {' '.join(move.uci() for move in stats.pv)}"
+    return text
+
 def main():
     mode = None
     if len(sys.argv) > 1:
@@ -63,55 +81,64 @@ def main():
         print('2. Maquina vs Maquina')
         sel = input('Opción (1/2): ')
         mode = 'pvai' if sel == '1' else 'aivai'
+    if len(sys.argv) > 2:
+        # python main.py aivai stats.jsonl: una línea JSON por jugada de las IAs
+        ai_white.stats_sink = ai_black.stats_sink = StatsSink(sys.argv[2])
 
     board = chess.Board()
     nodos_blancas = []
     nodos_negras = []
     jugadas = []
+    # pvai: la IA sigue pensando mientras el humano escribe su jugada
+    ponderer = Ponderer(ai_black) if mode == 'pvai' else None
+    esperada = None  # respuesta humana prevista (segunda jugada de la última PV)
 
     while not board.is_game_over():
         print_board(board)
         color = board.turn
         jugadas.append(len(jugadas) + 1)
         if mode == 'pvai' and color == chess.WHITE:
-            move = get_user_move(board, color)
+            ponderer.start(board, esperada)
+            try:
+                move = get_user_move(board, color)
+            except BaseException:
+                ponderer.stop()
+                raise
             nodos_blancas.append(0)
         elif mode == 'pvai' and color == chess.BLACK:
             ai = ai_black
-            result = ai.select_move(board, color)
-            if isinstance(result, (tuple, list)):
-                move = result[0]
-                nodos = result[1] if len(result) > 1 else None
+            stats = ponderer.finish(board)
+            if stats is not None:
+                print("Ponder acertado: respuesta preparada durante tu turno")
             else:
-                move = result
-                nodos = None
+                stats = ai.select_move(board, color)
+            move = stats.move
+            esperada = stats.pv[1] if len(stats.pv) > 1 else None
             if move is None:
                 print('No hay movimientos legales disponibles. Juego terminado.')
                 break
             print(f"Maquina (negras) mueve: {board.san(move)} ({move.uci()})")
-            print(f"Nodos evaluados: {nodos}" if nodos is not None else "")
-            nodos_negras.append(nodos if nodos is not None else 0)
+            print(describir(stats))
+            nodos_negras.append(stats.nodes)
         else:
             ai = ai_white if color == chess.WHITE else ai_black
-            result = ai.select_move(board, color)
-            if isinstance(result, (tuple, list)):
-                move = result[0]
-                nodos = result[1] if len(result) > 1 else None
-            else:
-                move = result
-                nodos = None
+            stats = ai.select_move(board, color)
+            move = stats.move
             if move is None:
                 print('No hay movimientos legales disponibles. Juego terminado.')
                 break
             print(f"{move}")
             print(f"Maquina ({'blancas' if color == chess.WHITE else 'negras'}) mueve: {board.san(move)} ({move.uci()})")
-            print(f"Nodos evaluados: {nodos}" if nodos is not None else "")
+            print(describir(stats))
             if color == chess.WHITE:
-                nodos_blancas.append(nodos if nodos is not None else 0)
+                nodos_blancas.append(stats.nodes)
             else:
-                nodos_negras.append(nodos if nodos is not None else 0)
+                nodos_negras.append(stats.nodes)
 
         board.push(move)
+    if ponderer is not None:
+        ponderer.stop()
+        print(f"Ponder: {ponderer.hits} aciertos, {ponderer.misses} fallos")
     print_board(board)
     print('Fin de la partida:', board.result(), "   ", board.is_checkmate())
     exportar_pgn(board)
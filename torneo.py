@@ -0,0 +1,169 @@
+"""
+Headless match / tournament runner: plays games between two or more AI
+specs (see IA/Registry.py) across a process pool, streams each finished
+game to a PGN file and prints a W/D/L table with an Elo estimate.
+
+    python torneo.py negamax:depth=3 mcts:n_simulations=300 --games 20 --workers 4
+    python torneo.py negamax minmax --time 0.5 --openings aperturas.epd --pgn torneo.pgn
+"""
+import argparse
+import itertools
+import math
+import multiprocessing
+import time
+import chess
+import chess.pgn
+
+from IA.Registry import build_ai, limit_kwargs, uses_processes
+from IA_interfaze import StatsSink
+
+
+def load_openings(path: str = None) -> list:
+    """FENs to start from: one FEN or EPD line per row (empty lines and '#' skipped)."""
+    if path is None:
+        return [chess.STARTING_FEN]
+    fens = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            board, _ = chess.Board.from_epd(line) if len(line.split()) != 6 else (chess.Board(line), None)
+            fens.append(board.fen())
+    return fens
+
+
+def play_game(task):
+    """Pool entry point: plays one game and returns its record (PGN text included)."""
+    game_id, white_spec, black_spec, fen, limits, max_plies, stats_path = task
+    engines = {chess.WHITE: build_ai(white_spec), chess.BLACK: build_ai(black_spec)}
+    sinks = []
+    if stats_path is not None:
+        for ai, spec in ((engines[chess.WHITE], white_spec), (engines[chess.BLACK], black_spec)):
+            ai.stats_sink = StatsSink(stats_path, game=game_id + 1, spec=spec)
+            sinks.append(ai.stats_sink)
+    board = chess.Board(fen)
+    start = time.perf_counter()
+    try:
+        while not board.is_game_over(claim_draw=True) and len(board.move_stack) < max_plies:
+            ai = engines[board.turn]
+            move = ai.select_move(board, board.turn, **limit_kwargs(ai, limits)).move
+            if move is None or move not in board.legal_moves:
+                break  # jugada ilegal o ninguna: pierde el bando que mueve
+            board.push(move)
+    finally:
+        for ai in engines.values():
+            if hasattr(ai, 'close'):
+                ai.close()
+        for sink in sinks:
+            sink.close()
+
+    if board.is_game_over(claim_draw=True):
+        result = board.result(claim_draw=True)
+    elif len(board.move_stack) >= max_plies:
+        result = "1/2-1/2"  # adjudicada: límite de jugadas
+    else:
+        result = "0-1" if board.turn == chess.WHITE else "1-0"
+
+    game = chess.pgn.Game.from_board(board)
+    game.headers["Event"] = "Torneo"
+    game.headers["Round"] = str(game_id + 1)
+    game.headers["White"] = white_spec
+    game.headers["Black"] = black_spec
+    game.headers["Result"] = result
+    return game_id, white_spec, black_spec, result, str(game), time.perf_counter() - start
+
+
+def schedule(specs: list, games: int, openings: list, limits: dict, max_plies: int,
+             stats_path: str = None) -> list:
+    """Round robin: `games` games per pair, colours alternated, openings cycled per colour pair."""
+    tasks = []
+    for a, b in itertools.combinations(specs, 2):
+        for i in range(games):
+            white, black = (a, b) if i % 2 == 0 else (b, a)
+            fen = openings[(i // 2) % len(openings)]
+            tasks.append((len(tasks), white, black, fen, limits, max_plies, stats_path))
+    return tasks
+
+
+def elo(wins: int, draws: int, losses: int):
+    """Elo difference and its 95% error margin from a W/D/L count (infinite at a 0% or 100% score)."""
+    n = wins + draws + losses
+    if n == 0:
+        return 0.0, float('inf')
+    score = (wins + 0.5 * draws) / n
+    if score in (0.0, 1.0):
+        # Todo victorias o todo derrotas: la diferencia no está acotada
+        return math.copysign(float('inf'), score - 0.5), float('inf')
+    variance = (wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score ** 2) / n
+    margin = 1.96 * math.sqrt(variance / n)
+
+    def to_elo(p):
+        p = min(max(p, 1e-6), 1 - 1e-6)
+        return -400 * math.log10(1 / p - 1)
+
+    return to_elo(score), (to_elo(score + margin) - to_elo(score - margin)) / 2
+
+
+def print_table(specs: list, stats: dict):
+    width = max(len("engine A"), *(len(spec) for spec in specs))
+    print(f"\n{'engine A':<{width}} {'engine B':<{width}} {'W':>4} {'D':>4} {'L':>4} {'score':>6} {'Elo A-B':>14}")
+    for a, b in itertools.combinations(specs, 2):
+        w, d, l = stats[(a, b)]
+        n = w + d + l
+        if not n:
+            continue
+        diff, margin = elo(w, d, l)
+        print(f"{a:<{width}} {b:<{width}} {w:>4} {d:>4} {l:>4} {(w + d / 2) / n:>6.1%} {diff:>+7.0f} ±{margin:<5.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Partidas sin interfaz entre IAs.")
+    parser.add_argument("engines", nargs="+", help="specs, p. ej. negamax:depth=3 mcts:n_simulations=300")
+    parser.add_argument("--games", type=int, default=10, help="partidas por pareja")
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--time", type=float, default=None, help="segundos por jugada")
+    parser.add_argument("--nodes", type=int, default=None, help="nodos por jugada (simulaciones en MCTS)")
+    parser.add_argument("--openings", default=None, help="fichero FEN/EPD con las posiciones iniciales")
+    parser.add_argument("--pgn", default="torneo.pgn", help="salida PGN (se escribe según terminan)")
+    parser.add_argument("--max-plies", type=int, default=300, help="tablas por adjudicación")
+    parser.add_argument("--stats", default=None, help="JSON lines con el SearchStats de cada jugada")
+    args = parser.parse_args()
+    if len(args.engines) < 2:
+        parser.error("hacen falta al menos dos motores")
+
+    for spec in args.engines:
+        build_ai(spec)  # validar los specs antes de arrancar el pool
+        if args.workers > 1 and uses_processes(spec):
+            # los procesos del pool son daemon y no pueden crear procesos hijos
+            parser.error(f"{spec}: un motor con workers>1 necesita --workers 1")
+    tasks = schedule(args.engines, args.games, load_openings(args.openings),
+                     {'time_limit': args.time, 'node_limit': args.nodes}, args.max_plies, args.stats)
+    stats = {pair: [0, 0, 0] for pair in itertools.combinations(args.engines, 2)}
+    start = time.perf_counter()
+
+    pool = multiprocessing.get_context().Pool(args.workers) if args.workers > 1 else None
+    results = pool.imap_unordered(play_game, tasks) if pool else map(play_game, tasks)
+    try:
+        with open(args.pgn, "w", encoding="utf-8") as pgn:
+            for done, (game_id, white, black, result, text, seconds) in enumerate(results, 1):
+                print(text, file=pgn, end="\n\n")
+                pgn.flush()
+                pair = (white, black) if (white, black) in stats else (black, white)
+                a_score = {"1-0": 1.0, "0-1": 0.0}.get(result, 0.5)
+                if pair[0] != white:
+                    a_score = 1 - a_score
+                stats[pair][{1.0: 0, 0.5: 1, 0.0: 2}[a_score]] += 1
+                print(f"[{done}/{len(tasks)}] #{game_id + 1} {white} - {black}: {result} ({seconds:.1f}s)")
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+
+    elapsed = time.perf_counter() - start
+    print_table(args.engines, stats)
+    print(f"\n{len(tasks)} partidas en {elapsed:.1f}s ({len(tasks) * 3600 / elapsed:.0f} partidas/hora), PGN: {args.pgn}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,207 @@
+"""
+UCI front-end for the AIs of IA/: plugs any engine spec (see IA/Registry.py)
+into a GUI or match tool.
+
+    python uci.py                          # negamax con profundización iterativa
+    python uci.py mcts:n_simulations=5000
+    python uci.py mcts:workers=4
+
+The search runs in a background thread, so `stop`, `isready` and `quit` are
+answered while it thinks, multi-process specs (Lazy SMP, root-parallel MCTS)
+included; `info` lines are streamed after every completed iteration
+(MinMax / Negamax) or every `INFO_EVERY` simulations (single-process MCTS).
+Supported: uci, isready, ucinewgame, setoption name Engine value <spec>,
+position [startpos | fen ...] [moves ...], go [wtime btime winc binc
+movestogo movetime nodes depth infinite ponder], stop, ponderhit, quit.
+"""
+import inspect
+import math
+import sys
+import threading
+import chess
+
+from IA_interfaze import SearchLimits
+from IA.Registry import build_ai
+
+DEFAULT_ENGINE = "negamax"
+MOVE_OVERHEAD = 0.05  # segundos reservados para la comunicación con la GUI
+MOVES_TO_GO = 30  # jugadas que se suponen pendientes si la GUI no manda movestogo
+
+
+def time_for_move(params: dict, turn: chess.Color):
+    """Seconds to think from the `go` parameters, or None without a clock."""
+    if "movetime" in params:
+        return max(params["movetime"] / 1000 - MOVE_OVERHEAD, 0.01)
+    left = params.get("wtime" if turn == chess.WHITE else "btime")
+    if left is None:
+        return None
+    inc = params.get("winc" if turn == chess.WHITE else "binc", 0)
+    budget = left / params.get("movestogo", MOVES_TO_GO) + 0.75 * inc
+    return max(min(budget, left / 2) / 1000 - MOVE_OVERHEAD, 0.01)
+
+
+class UCIEngine:
+    GO_PARAMS = ("wtime", "btime", "winc", "binc", "movestogo", "movetime", "nodes", "depth")
+
+    def __init__(self, spec: str = DEFAULT_ENGINE, out=sys.stdout):
+        self.out = out
+        self.spec = spec
+        self.ai = build_ai(spec)
+        self.board = chess.Board()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._limits = None
+        self._release = threading.Event()  # go infinite / ponder: bestmove solo tras stop o ponderhit
+        self._ponder_time = None
+
+    def send(self, line: str):
+        with self._lock:
+            self.out.write(line + "\n")
+            self.out.flush()
+
+    # ------------------ COMMANDS ------------------ #
+    def handle(self, line: str) -> bool:
+        """Process one command line; False on quit."""
+        tokens = line.split()
+        if not tokens:
+            return True
+        command, args = tokens[0], tokens[1:]
+        if command == "uci":
+            self.send("id name Chess IA (" + self.spec + ")")
+            self.send("id author Chess IA")
+            self.send(f"option name Engine type string default {self.spec}")
+            self.send("uciok")
+        elif command == "isready":
+            self.send("readyok")
+        elif command == "ucinewgame":
+            self.stop()
+            self._new_engine(self.spec)
+        elif command == "setoption":
+            self._setoption(args)
+        elif command == "position":
+            self._position(args)
+        elif command == "go":
+            self._go(args)
+        elif command == "stop":
+            self.stop()
+        elif command == "ponderhit":
+            self._ponderhit()
+        elif command == "quit":
+            self.stop()
+            if hasattr(self.ai, 'close'):
+                self.ai.close()
+            return False
+        return True
+
+    def _new_engine(self, spec: str):
+        if hasattr(self.ai, 'close'):
+            self.ai.close()
+        self.ai = build_ai(spec)
+        self.spec = spec
+
+    def _setoption(self, args: list):
+        if "name" not in args or "value" not in args:
+            return
+        name = " ".join(args[args.index("name") + 1:args.index("value")])
+        value = " ".join(args[args.index("value") + 1:])
+        if name.lower() == "engine":
+            self.stop()
+            try:
+                self._new_engine(value)
+            except (ValueError, TypeError) as exc:
+                self.send(f"info string {exc}")
+
+    def _position(self, args: list):
+        self.stop()
+        if args and args[0] == "startpos":
+            board, rest = chess.Board(), args[1:]
+        elif args and args[0] == "fen":
+            end = args.index("moves") if "moves" in args else len(args)
+            board, rest = chess.Board(" ".join(args[1:end])), args[end:]
+        else:
+            return
+        if rest and rest[0] == "moves":
+            for uci in rest[1:]:
+                board.push_uci(uci)
+        self.board = board
+
+    def _go(self, args: list):
+        self.stop()
+        params = {}
+        for i, token in enumerate(args[:-1]):
+            if token in self.GO_PARAMS:
+                params[token] = int(args[i + 1])
+        infinite = "infinite" in args or "ponder" in args
+        time_limit = None if infinite else time_for_move(params, self.board.turn)
+        # ponder: se busca sin reloj; en ponderhit se arranca el tiempo calculado
+        self._ponder_time = time_for_move(params, self.board.turn) if "ponder" in args else None
+        max_depth = params.get("depth")
+        if max_depth is None and not infinite and time_limit is None and "nodes" not in params:
+            max_depth = getattr(self.ai, 'depth', None)  # "go" sin más: la profundidad del motor
+        self._limits = SearchLimits(time_limit, params.get("nodes"),
+                                    stop_event=threading.Event() if infinite else None,
+                                    max_depth=max_depth)
+        self._release.clear()
+        if not infinite:
+            self._release.set()
+        self._thread = threading.Thread(target=self._search, args=(self.board.copy(), self._limits), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the running search (if any) and wait for its bestmove."""
+        if self._thread is None:
+            return
+        self._limits.stop()
+        if self._limits.stop_event is not None:
+            self._limits.stop_event.set()
+        self._release.set()
+        self._thread.join()
+        self._thread = None
+
+    def _ponderhit(self):
+        if self._thread is None or self._release.is_set():
+            return
+        if self._ponder_time is not None:
+            self._limits.set_time_limit(self._ponder_time)
+            self._limits.release_stop_event()  # desde aquí manda el reloj
+            self._release.set()
+        # sin reloj conocido se sigue como "go infinite" hasta stop
+
+    # ------------------ SEARCH THREAD ------------------ #
+    def _search(self, board: chess.Board, limits: SearchLimits):
+        ai = self.ai
+        ai.on_info = self._info
+        try:
+            if 'limits' in inspect.signature(ai.select_move).parameters:
+                stats = ai.select_move(board, board.turn, limits=limits)
+            else:
+                stats = ai.select_move(board, board.turn)
+        finally:
+            ai.on_info = None
+        self._release.wait()  # go infinite: la GUI decide cuándo se juega
+        if stats.move is None:
+            self.send("bestmove 0000")
+        elif len(stats.pv) > 1:
+            self.send(f"bestmove {stats.move.uci()} ponder {stats.pv[1].uci()}")
+        else:
+            self.send(f"bestmove {stats.move.uci()}")
+
+    def _info(self, stats):
+        parts = [f"info depth {stats.depth}"]
+        if stats.score is not None and math.isfinite(stats.score):
+            parts.append(f"score cp {int(stats.score)}")
+        parts.append(f"nodes {stats.nodes + stats.qnodes} nps {stats.nps:.0f} time {stats.elapsed * 1000:.0f}")
+        if stats.pv:
+            parts.append("pv " + " ".join(move.uci() for move in stats.pv))
+        self.send(" ".join(parts))
+
+
+def main():
+    engine = UCIEngine(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_ENGINE)
+    for line in sys.stdin:
+        if not engine.handle(line):
+            break
+
+
+if __name__ == '__main__':
+    main()